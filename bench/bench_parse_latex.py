@@ -0,0 +1,32 @@
+"""Time to parse typical bibliography fields from LaTeX,
+with the full pylatexenc parser and with the fast parser.
+
+Usage: python bench/bench_parse_latex.py [sources]
+"""
+
+import sys
+import time
+from typing import List
+
+from rite.parse.latex import ParseLatex
+
+
+def make_sources(size: int) -> List[str]:
+    return [
+        rf"On the \emph{{{i}th}} r\^ole of {{\small Gr\"obner}} bases"
+        rf" in \textbf{{Caf\'e}} \& \textit{{Na\"ive}} theory --- part {i}"
+        for i in range(size)]
+
+
+def main(size: int) -> None:
+    sources = make_sources(size)
+    for name, parse in [('full', ParseLatex(fast=False)),
+                        ('fast', ParseLatex())]:
+        start = time.perf_counter()
+        for source in sources:
+            list(parse(source))
+        print(f"{name:>6}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,33 @@
+"""Time to create a LaTeX parser, with freshly built contexts,
+with the shared default contexts, and from the shared parsers.
+
+Usage: python bench/bench_parse_latex_init.py [parsers]
+"""
+
+import sys
+import time
+
+from rite.parse.latex import (
+    ParseLatex, shared_parse_latex,
+    _default_latex_walker_context_db, _default_latex_text_context_db,
+)
+
+
+def fresh_parse_latex() -> ParseLatex:
+    return ParseLatex(
+        walker_context=_default_latex_walker_context_db.__wrapped__(),
+        nodes_to_text_context=_default_latex_text_context_db.__wrapped__())
+
+
+def main(size: int) -> None:
+    for name, factory in [('fresh', fresh_parse_latex),
+                          ('default', ParseLatex),
+                          ('shared', shared_parse_latex)]:
+        start = time.perf_counter()
+        for _ in range(size):
+            factory()
+        print(f"{name:>8}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,46 @@
+"""Peak memory and time to parse an XML document with many records,
+as a full tree and as a stream of records.
+
+Usage: python bench/bench_parse_xml.py [records]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Iterable
+from xml.etree.ElementTree import parse
+
+from rite.parse.xml import ParseXml, ParseXmlRecords
+from rite.richtext import Text
+
+
+def make_document(size: int) -> bytes:
+    return b''.join(
+        [b'<records>']
+        + [b'<record><b>Author %d</b>. <i>Title %d</i>. '
+           b'<span style="font-variant:small-caps">Journal</span>.</record>'
+           % (i, i) for i in range(size)]
+        + [b'</records>'])
+
+
+def measure(name: str, func: Callable[[], Iterable[Text]]) -> None:
+    start = time.perf_counter()
+    deque(func(), maxlen=0)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    deque(func(), maxlen=0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>7}: {duration:.3f}s {peak / 2 ** 20:.1f}MiB")
+
+
+def main(size: int) -> None:
+    document = make_document(size)
+    measure('tree', lambda: ParseXml()(parse(io.BytesIO(document)).getroot()))
+    measure('records', lambda: ParseXmlRecords('record')(io.BytesIO(document)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
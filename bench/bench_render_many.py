@@ -0,0 +1,50 @@
+"""Time to evaluate and render a citation template over many records,
+in this process and over process pools of increasing size.
+
+Usage: python bench/bench_render_many.py [records]
+"""
+
+import os
+import sys
+import time
+from operator import itemgetter
+from typing import Any, Dict, List
+
+from rite.richtext import Semantics, FontStyles
+from rite.style.batch import render_many
+from rite.style.template import Description
+
+citation: Description = ('join', [
+    ('join', [('semantic', itemgetter(f'author{i}'), Semantics.STRONG)
+              for i in range(3)], ', ', ' and ', ', and '),
+    ('str_', ' ('), itemgetter('year'), ('str_', '). '),
+    ('capfirst', ('font_style', itemgetter('title'), FontStyles.ITALIC)),
+    ('str_', '. '),
+    ('semantic', ('join', [itemgetter('journal'), ('str_', ', '),
+                           ('font_weight', itemgetter('volume'), 700)]),
+     Semantics.EMPHASIS),
+    ('str_', '.'),
+])
+
+
+def make_records(size: int) -> List[Dict[str, Any]]:
+    return [dict(author0=f'Author{i % 97}', author1='B. Second',
+                 author2='C. Third', year=str(1950 + i % 70),
+                 title=f'title number {i}', journal=f'Journal{i % 53}',
+                 volume=str(i % 40))
+            for i in range(size)]
+
+
+def main(size: int) -> None:
+    records = make_records(size)
+    cpus = os.cpu_count() or 1
+    for workers in [0] + [n for n in [1, 2, 4, 8, 16] if n <= cpus]:
+        start = time.perf_counter()
+        for _ in render_many(citation, records, 'html', workers=workers,
+                             chunksize=500):
+            pass
+        print(f"{workers:>3} workers: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,91 @@
+"""Memory and construction time of the rich text node classes,
+compared with the original frozen dataclasses,
+on a corpus of bibliography entries.
+
+Usage: python bench/bench_richtext.py [entries]
+"""
+
+import dataclasses
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from rite.richtext import (
+    Join, Semantic, Semantics, FontStyle, FontStyles, FontWeight
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class OldJoin:
+    children: List[Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class OldChild:
+    child: Any
+
+
+@dataclasses.dataclass(frozen=True)
+class OldSemantic(OldChild):
+    semantic: Semantics
+
+
+@dataclasses.dataclass(frozen=True)
+class OldFontStyle(OldChild):
+    font_style: FontStyles
+
+
+@dataclasses.dataclass(frozen=True)
+class OldFontWeight(OldChild):
+    font_weight: int
+
+
+Fields = Tuple[str, str, str, str, str]
+
+
+def make_fields(size: int) -> List[Fields]:
+    return [(f"Author{i % 997}", f"A. and Coauthor{i % 89}, B.",
+             f"Title of paper number {i}", f"Journal{i % 53}",
+             f", {1950 + i % 70}.")
+            for i in range(size)]
+
+
+def make_corpus(fields: List[Fields], join: Callable, semantic: Callable,
+                font_style: Callable, font_weight: Callable) -> List[Any]:
+    return [
+        join([
+            join([semantic(author, Semantics.STRONG), ", ", coauthors]),
+            ". ",
+            font_style(title, FontStyles.ITALIC),
+            ". ",
+            semantic(font_weight(journal, 700), Semantics.EMPHASIS),
+            year,
+        ])
+        for author, coauthors, title, journal, year in fields]
+
+
+def measure(fields: List[Fields], *classes: Callable) -> Tuple[float, int]:
+    """Construction time and memory used by the nodes of the corpus."""
+    start = time.perf_counter()
+    make_corpus(fields, *classes)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    corpus = make_corpus(fields, *classes)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(corpus) == len(fields)
+    return elapsed, memory
+
+
+def main(size: int) -> None:
+    fields = make_fields(size)
+    old = measure(fields, OldJoin, OldSemantic, OldFontStyle, OldFontWeight)
+    new = measure(fields, Join, Semantic, FontStyle, FontWeight)
+    print(f"{size} entries")
+    for name, (elapsed, memory) in [('dataclass', old), ('slotted', new)]:
+        print(f"{name:>10}: {elapsed:.3f}s {memory / 2 ** 20:.1f}MiB")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,39 @@
+"""Time to assemble a document by appending entries one at a time,
+to a join and to a rope.
+
+Usage: python bench/bench_rope.py
+"""
+
+import time
+
+from rite.richtext import Join, Semantic, Semantics
+from rite.richtext.rope import Rope
+
+
+def append_join(size: int) -> Join:
+    text = Join([])
+    for i in range(size):
+        text = Join(text.children + (Semantic(str(i), Semantics.STRONG),))
+    return text
+
+
+def append_rope(size: int) -> Rope:
+    text = Rope()
+    for i in range(size):
+        text = text.append(Semantic(str(i), Semantics.STRONG))
+    return text
+
+
+def main() -> None:
+    print(f"{'entries':>8} {'join':>10} {'rope':>10}")
+    for size in [1000, 10000, 30000]:
+        timings = []
+        for func in [append_join, append_rope]:
+            start = time.perf_counter()
+            func(size)
+            timings.append(time.perf_counter() - start)
+        print(f"{size:>8}" + "".join(f" {t:>9.3f}s" for t in timings))
+
+
+if __name__ == '__main__':
+    main()
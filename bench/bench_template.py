@@ -0,0 +1,67 @@
+"""Evaluation time of a citation template, as nested node objects,
+compiled into a single function, and with constant subtemplates
+folded.
+
+Usage: python bench/bench_template.py [records]
+"""
+
+import sys
+import time
+from typing import Any, Dict, List
+
+from rite.richtext import Text, Semantics, FontStyles, FontVariants
+from rite.style.compiler import template_compile
+from rite.style.optimizer import template_optimize
+from rite.style.template import Description, Node, template_build
+
+
+def field(name: str) -> Node[Dict[str, Any]]:
+    def fmt(data: Dict[str, Any]) -> Text:
+        return data[name]
+    return fmt
+
+
+def author(index: int) -> Node[Dict[str, Any]]:
+    def fmt(data: Dict[str, Any]) -> Text:
+        return data['authors'][index]
+    return fmt
+
+
+citation: Description = ('join', [
+    ('join', [('semantic', author(i), Semantics.STRONG) for i in range(3)],
+     ', ', ' and ', ', and '),
+    ('str_', ' ('), field('year'), ('str_', '). '),
+    ('capfirst', ('font_style', field('title'), FontStyles.ITALIC)),
+    ('str_', '. '),
+    ('semantic', ('join', [field('journal'), ('str_', ', '),
+                           ('font_weight', field('volume'), 700)]),
+     Semantics.EMPHASIS),
+    ('str_', '. '),
+    ('font_variant', ('join', [('upper', ('str_', 'available')),
+                               ('str_', 'online')], ' '),
+     FontVariants.SMALL_CAPS),
+])
+
+
+def make_records(size: int) -> List[Dict[str, Any]]:
+    return [dict(authors=[f'Author{i % 97}', 'B. Second', 'C. Third'],
+                 year=str(1950 + i % 70), title=f'title number {i}',
+                 journal=f'Journal{i % 53}', volume=str(i % 40))
+            for i in range(size)]
+
+
+def main(size: int) -> None:
+    records = make_records(size)
+    for name, node in [('nodes', template_build(citation)),
+                       ('compiled', template_compile(citation)),
+                       ('optimized', template_optimize(citation)),
+                       ('both', template_compile(template_optimize(citation)))
+                       ]:
+        start = time.perf_counter()
+        for record in records:
+            node(record)
+        print(f"{name:>10}: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
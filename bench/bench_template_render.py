@@ -0,0 +1,32 @@
+"""Time to evaluate a citation template and render it to html,
+by building the rich text first, and by streaming template events
+straight into the renderer.
+
+Usage: python bench/bench_template_render.py [records]
+"""
+
+import sys
+import time
+
+from rite.render.html import RenderHtml
+from rite.style.template import template_build, template_render
+
+from bench_template import citation, make_records
+
+
+def main(size: int) -> None:
+    records = make_records(size)
+    template = template_build(citation)
+    render = RenderHtml()
+    start = time.perf_counter()
+    for record in records:
+        ''.join(render(template(record)))
+    print(f"  two step: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for record in records:
+        ''.join(template_render(template, record, render))
+    print(f"    stream: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
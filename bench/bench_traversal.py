@@ -0,0 +1,54 @@
+"""Traversal time of deeply nested rich text,
+compared with the original recursive generators.
+
+Usage: python bench/bench_traversal.py
+"""
+
+import sys
+import time
+from typing import Callable, Iterable
+
+from rite.render.html import RenderHtml
+from rite.richtext import Text, Join, Semantic, Semantics
+from rite.richtext.utils import text_iter
+
+
+def recursive_text_iter(text: Text) -> Iterable[str]:
+    if isinstance(text, str):
+        yield text
+    else:
+        for child in text:
+            yield from recursive_text_iter(child)
+
+
+def make_tree(depth: int) -> Text:
+    text: Text = 'x'
+    for i in range(depth):
+        text = Semantic(Join([str(i % 10), text]), Semantics.EMPHASIS)
+    return text
+
+
+def measure(func: Callable[[Text], Iterable[str]], text: Text) -> str:
+    start = time.perf_counter()
+    try:
+        for _ in func(text):
+            pass
+    except RecursionError:
+        return 'RecursionError'
+    return f'{time.perf_counter() - start:.4f}s'
+
+
+def main() -> None:
+    sys.setrecursionlimit(20000)
+    render_html = RenderHtml()
+    print(f"{'depth':>7} {'recursive':>15} {'text_iter':>15} {'html':>15}")
+    for depth in [1000, 3000, 10000, 30000, 100000]:
+        text = make_tree(depth)
+        print(f"{depth:>7}"
+              f" {measure(recursive_text_iter, text):>15}"
+              f" {measure(text_iter, text):>15}"
+              f" {measure(render_html, text):>15}")
+
+
+if __name__ == '__main__':
+    main()
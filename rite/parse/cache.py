@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from rite.richtext import Text
+from rite.style.template import CacheInfo
+
+SourceType = TypeVar('SourceType', bound=Hashable)
+
+
+class ParseCache(Generic[SourceType]):
+    """Thread safe cache from sources to their parsed texts,
+    which evicts the least recently used source once there are more
+    than *maxsize* (no limit if ``None``).
+    Rich text is immutable, so a cache can be shared between threads,
+    and between parsers, as long as these parsers have the same settings.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[SourceType, Tuple[Text, ...]]" = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: SourceType,
+            parse: Callable[[SourceType], Tuple[Text, ...]]
+            ) -> Tuple[Text, ...]:
+        """The cached texts of *source*, or, if not yet cached,
+        the texts returned by *parse*, which are then cached.
+        The source is parsed outside the lock, so threads parsing
+        different sources do not wait for each other.
+        """
+        with self._lock:
+            texts = self._cache.get(source)
+            if texts is not None:
+                self.hits += 1
+                self._cache.move_to_end(source)
+                return texts
+            self.misses += 1
+        texts = parse(source)
+        with self._lock:
+            self._cache[source] = texts
+            self._cache.move_to_end(source)
+            if self.maxsize is not None and len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return texts
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss statistics, as for :func:`functools.lru_cache`."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._cache))
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups which were found in the cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+    def cache_clear(self) -> None:
+        """Clear the cache and its statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
@@ -1,10 +1,115 @@
-from xml.etree.ElementTree import fromstring
-from typing import Iterable
+import dataclasses
+from html.parser import HTMLParser
+from xml.etree.ElementTree import Element, fromstring
+from typing import Iterable, List, Optional, Tuple, Union
 
-from rite.parse.xml import ParseXml
+from rite.parse.xml import ParseXml, style_texts
 from rite.richtext import Text
+from rite.richtext.utils import texts_normalize
 
 
+@dataclasses.dataclass(frozen=True)
 class ParseHtml:
+    normalize: bool = False  #: Normalize the parsed text.
+
     def __call__(self, source: str) -> Iterable[Text]:
-        return ParseXml()(fromstring(f"<body>{source}</body>"))
+        return ParseXml(normalize=self.normalize)(
+            fromstring(f"<body>{source}</body>"))
+
+
+_void_tags = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'])
+
+_closes_paragraph_tags = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hgroup', 'hr', 'main',
+    'menu', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul'])
+
+
+class HtmlTextParser(HTMLParser):
+    """Incremental parser for html as found in the wild, which maps tags
+    and styles to rich text as :class:`~rite.parse.xml.ParseXml` does.
+    Feed it chunks of html with :meth:`feed`, and take the top level texts
+    completed so far with :meth:`read_texts`.
+    Void elements such as ``<br>``, unclosed paragraphs and other elements,
+    stray end tags, and character references such as ``&nbsp;``
+    are all accepted.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # open elements, with the texts of their children so far
+        self._stack: List[Tuple[Element, List[Text]]] = []
+        self._texts: List[Text] = []
+        self._data: List[str] = []
+
+    def _children(self) -> List[Text]:
+        return self._stack[-1][1] if self._stack else self._texts
+
+    def _flush_data(self) -> None:
+        if self._data:
+            self._children().append(''.join(self._data))
+            self._data.clear()
+
+    def _close_element(self) -> None:
+        element, children = self._stack.pop()
+        self._children().extend(style_texts(element, children))
+
+    def handle_starttag(self, tag: str,
+                        attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush_data()
+        if tag in _closes_paragraph_tags \
+                and self._stack and self._stack[-1][0].tag == 'p':
+            self._close_element()
+        self._stack.append(
+            (Element(tag, {name: value or '' for name, value in attrs}), []))
+        if tag in _void_tags:
+            self._close_element()
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_data()
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0].tag == tag:
+                while len(self._stack) > index:
+                    self._close_element()
+                break
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def close(self) -> None:
+        """Process any remaining input, and close all open elements."""
+        super().close()
+        self._flush_data()
+        while self._stack:
+            self._close_element()
+
+    def read_texts(self) -> List[Text]:
+        """Top level texts completed since the last call."""
+        texts, self._texts = self._texts, []
+        return texts
+
+
+@dataclasses.dataclass(frozen=True)
+class ParseHtmlChunks:
+    """Parse html from a string or from an iterable of chunks,
+    such as a text file, with :class:`HtmlTextParser`.
+    Texts are generated as soon as they are complete,
+    unless they need to be normalized.
+    """
+    normalize: bool = False  #: Normalize the parsed text.
+
+    def __call__(self, source: Union[str, Iterable[str]]) -> Iterable[Text]:
+        texts = self._parse([source] if isinstance(source, str) else source)
+        return texts_normalize(texts) if self.normalize else texts
+
+    @staticmethod
+    def _parse(chunks: Iterable[str]) -> Iterable[Text]:
+        parser = HtmlTextParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.read_texts()
+        parser.close()
+        yield from parser.read_texts()
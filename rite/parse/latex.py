@@ -1,6 +1,10 @@
 import dataclasses
-from functools import singledispatch
-from typing import Dict, Optional, Callable, Iterable, Iterator, Any
+import re
+import threading
+from functools import lru_cache, singledispatch
+from typing import (
+    Dict, Optional, Callable, Iterable, Iterator, Any, List, Tuple, Union
+)
 
 from pylatexenc.latex2text import LatexNodes2Text
 from pylatexenc.latexwalker import (
@@ -15,11 +19,13 @@ from pylatexenc.macrospec import (
     MacroSpec, MacroStandardArgsParser, std_macro, LatexContextDb
 )
 
+from rite.parse.cache import ParseCache
 from rite.richtext import (
     Text, Join,
     Semantics, FontSizes, FontStyles, FontVariants, Semantic,
     FontSize, FontStyle, FontWeight, FontVariant
 )
+from rite.richtext.utils import texts_normalize
 
 
 def no_style() -> Callable[[Text], Text]:
@@ -109,18 +115,47 @@ def _smart_join(texts: Iterable[Text]) -> Text:
         return Join(texts_list)
 
 
+@dataclasses.dataclass
+class _LatexFrame:
+    """Nodes still to be parsed, and the texts parsed so far,
+    which are wrapped in *style*, if any, once all nodes are parsed.
+    Barren style macros apply to the remaining nodes
+    only if *nodes* is a node list.
+    """
+    nodes: Iterator[LatexNode]
+    style: Optional[Callable[[Text], Text]]
+    is_list: bool
+    texts: List[Text] = dataclasses.field(default_factory=list)
+
+
 def _parse_latex_nodes(nodes: Iterator[LatexNode],
-                       nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    """Helper function to parse a list of nodes."""
-    node: Optional[LatexNode] = next(nodes, None)
-    while node is not None:
-        if isinstance(node, LatexMacroNode) \
+                       nodes_to_text: LatexNodes2Text) -> List[Text]:
+    """Helper function to parse a list of nodes, using an explicit stack
+    rather than recursion.
+    """
+    stack: List[_LatexFrame] = [_LatexFrame(nodes, None, True)]
+    while True:
+        frame = stack[-1]
+        node: Optional[LatexNode] = next(frame.nodes, None)
+        if node is None:
+            stack.pop()
+            if not stack:
+                return frame.texts
+            if frame.style is None:
+                stack[-1].texts.extend(frame.texts)
+            else:
+                stack[-1].texts.append(frame.style(_smart_join(frame.texts)))
+        elif frame.is_list and isinstance(node, LatexMacroNode) \
                 and node.macroname in style_map_barren:
-            yield style_map_barren[node.macroname](
-                _smart_join(_parse_latex_nodes(nodes, nodes_to_text)))
+            # the style applies to the remaining nodes of this list
+            stack.append(_LatexFrame(
+                frame.nodes, style_map_barren[node.macroname], True))
         else:
-            yield from _parse_latex(node, nodes_to_text)
-        node = next(nodes, None)
+            result = _parse_latex(node, nodes_to_text)
+            if isinstance(result, _LatexFrame):
+                stack.append(result)
+            else:
+                frame.texts.extend(result)
 
 
 def _text_macro_spec(name: str) -> MacroSpec:
@@ -128,7 +163,11 @@ def _text_macro_spec(name: str) -> MacroSpec:
         name, args_parser=MacroStandardArgsParser('{', args_math_mode=[False]))
 
 
+@lru_cache(maxsize=None)
 def _default_latex_walker_context_db() -> LatexContextDb:
+    """The default walker context, built once and shared by all parsers,
+    so it must not be modified.
+    """
     latex_walker_context = get_default_latex_walker_context_db()
     # add missing macros (will be fixed with pylatexenc > 2.8)
     latex_walker_context.add_context_category('rite', [
@@ -141,10 +180,161 @@ def _default_latex_walker_context_db() -> LatexContextDb:
     return latex_walker_context
 
 
+@lru_cache(maxsize=None)
 def _default_latex_text_context_db() -> LatexContextDb:
+    """The default text context, built once and shared by all parsers,
+    so it must not be modified.
+    """
     return get_default_latex_text_context_db()
 
 
+def _fast_argspec(spec: Any) -> Optional[str]:
+    """The argument specification of a macro or specials, if it is one
+    that the fast parser understands, otherwise ``None``.
+    """
+    if spec is None or spec.args_parser is None:
+        return ''
+    argspec = getattr(spec.args_parser, 'argspec', None)
+    math_mode = getattr(spec.args_parser, 'args_math_mode', None)
+    if argspec == '' or (argspec == '{' and not any(math_mode or [])):
+        return argspec
+    return None
+
+
+class _FastParseLatex:
+    """Single pass parser for the common subset of LaTeX: characters,
+    braces, specials, the macros from :data:`style_map` and
+    :data:`style_map_barren`, and macros without arguments or with a
+    single letter argument, such as escapes and accents.
+    The texts of the latter are found with the full parser, and cached.
+    Parsing returns ``None`` on any other input,
+    such as comments, math, environments, or unbalanced braces.
+    """
+
+    def __init__(self, walker_context: LatexContextDb,
+                 parse_full: Callable[[str], Iterable[Text]]) -> None:
+        self.walker_context = walker_context
+        self.styles: Dict[str, Callable[[Text], Text]] = {
+            name: style for name, style in style_map.items()
+            if _fast_argspec(walker_context.get_macro_spec(name)) == '{'}
+        self.barren_styles: Dict[str, Callable[[Text], Text]] = {
+            name: style for name, style in style_map_barren.items()
+            if _fast_argspec(walker_context.get_macro_spec(name)) == ''}
+        specials_starts = ''.join(sorted(set(
+            spec.specials_chars[0]
+            for spec in walker_context.iter_specials_specs())))
+        self.special_re = re.compile(
+            f'[{re.escape(specials_starts)}]' if specials_starts else '(?!)')
+        self.token_re = re.compile(rf'[\\{{}}%$]|{self.special_re.pattern}')
+        self.tokens: ParseCache[str] = ParseCache(maxsize=1024)
+        self.parse_full = parse_full
+
+    def _parse_token(self, token: str) -> Tuple[Text, ...]:
+        return tuple(self.parse_full(token))
+
+    def _macro_end(self, source: str, pos: int) -> Tuple[str, int]:
+        """Name of the macro at *pos* and the end of its post space."""
+        end = pos + 2
+        if source[pos + 1].isalpha():
+            while end < len(source) and source[end].isalpha():
+                end += 1
+            name = source[pos + 1:end]
+            space = end
+            while space < len(source) and source[space].isspace():
+                space += 1
+                if source.endswith('\n\n', 0, space):
+                    space -= 2
+                    break
+            return name, space
+        return source[pos + 1], end
+
+    def _letter_end(self, source: str, pos: int) -> Optional[int]:
+        """End of a single letter argument at *pos*, if any."""
+        if source[pos:pos + 1].isalpha() \
+                and not self.special_re.match(source, pos):
+            return pos + 1
+        elif source[pos:pos + 1] == '{' and source[pos + 2:pos + 3] == '}':
+            return self._letter_end(source, pos + 1) and pos + 3
+        return None
+
+    def __call__(self, source: str) -> Optional[List[Text]]:
+        # frames of texts, with their style, and whether they are barren
+        frames: List[Tuple[List[Text], Optional[Callable[[Text], Text]],
+                           bool]] = [([], None, False)]
+
+        def close_frame() -> None:
+            texts, style, _ = frames.pop()
+            if style is None:
+                frames[-1][0].extend(texts)
+            else:
+                frames[-1][0].append(style(_smart_join(texts)))
+
+        start = pos = 0
+        while True:
+            match = self.token_re.search(source, pos)
+            end = match.start() if match is not None else len(source)
+            char = source[end:end + 1]
+            special = None
+            if char and char not in '\\{}%$':
+                special = self.walker_context.test_for_specials(source, end)
+                if special is None:
+                    # not a specials after all, so it is just a character
+                    pos = end + 1
+                    continue
+            if end > start:
+                frames[-1][0].append(source[start:end])
+            if not char:
+                break
+            elif special is not None:
+                if _fast_argspec(special) != '':
+                    return None
+                frames[-1][0].append(special.specials_chars)
+                pos = end + len(special.specials_chars)
+            elif char == '{':
+                frames.append(([], None, False))
+                pos = end + 1
+            elif char == '}':
+                while frames[-1][2]:
+                    close_frame()
+                if len(frames) == 1:
+                    return None
+                close_frame()
+                pos = end + 1
+            elif char == '\\' and end + 1 < len(source):
+                name, pos = self._macro_end(source, end)
+                style = self.styles.get(name)
+                if style is not None:
+                    if source[pos:pos + 1] != '{':
+                        return None
+                    frames.append(([], style, False))
+                    pos += 1
+                elif name in self.barren_styles:
+                    frames.append(([], self.barren_styles[name], True))
+                elif name in ('begin', 'end', '(', ')', '[', ']'):
+                    return None
+                else:
+                    argspec = _fast_argspec(
+                        self.walker_context.get_macro_spec(name))
+                    if argspec == '{':
+                        letter_end = self._letter_end(source, pos)
+                        if letter_end is None:
+                            return None
+                        token = source[end:letter_end]
+                        pos = letter_end
+                    elif argspec == '':
+                        token = source[end:end + 1 + len(name)]
+                    else:
+                        return None
+                    frames[-1][0].extend(
+                        self.tokens.get(token, self._parse_token))
+            else:
+                return None
+            start = pos
+        while frames[-1][2]:
+            close_frame()
+        return frames[0][0] if len(frames) == 1 else None
+
+
 @dataclasses.dataclass(frozen=True)
 class ParseLatex:
     walker_context: LatexContextDb = dataclasses.field(
@@ -154,66 +344,115 @@ class ParseLatex:
         default_factory=_default_latex_text_context_db)
     nodes_to_text_flags: Dict[str, Any] = \
         dataclasses.field(default_factory=dict)
+    normalize: bool = False  #: Normalize the parsed text.
+    #: Parse common input with a fast single pass parser, falling back
+    #: to the full parser on anything else.
+    fast: bool = True
+    #: Cache of parsed sources, shared by all users of the cache.
+    cache: Optional[ParseCache[str]] = dataclasses.field(
+        default=None, compare=False)
     nodes_to_text: LatexNodes2Text = dataclasses.field(init=False)
+    _fast_parse: Optional[_FastParseLatex] = dataclasses.field(
+        init=False, repr=False, compare=False)
 
     def __post_init__(self):
         object.__setattr__(self, "nodes_to_text", LatexNodes2Text(
             latex_context=self.nodes_to_text_context,
             **self.nodes_to_text_flags))
+        # walker flags can change the parse, so leave these to pylatexenc
+        object.__setattr__(self, "_fast_parse", _FastParseLatex(
+            self.walker_context, self._parse_full)
+            if self.fast and not self.walker_flags else None)
 
-    def __call__(self, source: str) -> Iterable[Text]:
+    def _parse_full(self, source: str) -> Iterable[Text]:
         walker = LatexWalker(
             source, latex_context=self.walker_context, **self.walker_flags)
         nodes, _, _ = walker.get_latex_nodes()
-        yield from _parse_latex_nodes(iter(nodes), self.nodes_to_text)
+        return _parse_latex_nodes(iter(nodes), self.nodes_to_text)
+
+    def _parse(self, source: str) -> Iterable[Text]:
+        texts: Optional[Iterable[Text]] = None
+        if self._fast_parse is not None:
+            texts = self._fast_parse(source)
+        if texts is None:
+            texts = self._parse_full(source)
+        yield from texts_normalize(texts) if self.normalize else texts
+
+    def _parse_tuple(self, source: str) -> Tuple[Text, ...]:
+        return tuple(self._parse(source))
+
+    def __call__(self, source: str) -> Iterable[Text]:
+        if self.cache is None:
+            return self._parse(source)
+        return iter(self.cache.get(source, self._parse_tuple))
+
+
+# common accents and escapes, to warm up the fast parser
+_warm_up_latex: str = ''.join(
+    rf'\{accent}{vowel}' for accent in '\'`^"~=.' for vowel in 'aeiouAEIOU'
+) + r'\c{c}\c{C}\%\&\#\_\$\{\}\ss\i\o\O\ae\AE\oe\OE\aa\AA\l\L'
+_shared_parsers: Dict[Tuple[bool, bool], ParseLatex] = {}
+_shared_parsers_lock = threading.Lock()
+
+
+def shared_parse_latex(normalize: bool = False, fast: bool = True
+                       ) -> ParseLatex:
+    """A parser with the default contexts and the given options,
+    created and warmed up on common accents and escapes
+    on first use, and shared by all callers and threads.
+    """
+    with _shared_parsers_lock:
+        parse = _shared_parsers.get((normalize, fast))
+        if parse is None:
+            parse = ParseLatex(normalize=normalize, fast=fast)
+            list(parse(_warm_up_latex))
+            _shared_parsers[normalize, fast] = parse
+        return parse
 
 
 @singledispatch
-def _parse_latex(node: LatexNode,
-                 nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
+def _parse_latex(node: LatexNode, nodes_to_text: LatexNodes2Text
+                 ) -> Union[Iterable[Text], _LatexFrame]:
+    """The texts of the node, or a frame to parse its children."""
     raise NotImplementedError(f'cannot handle {type(node)}')
 
 
 @_parse_latex.register(LatexCharsNode)
 def _chars_node(node: LatexCharsNode,
                 nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    yield node.chars
+    return [node.chars]
 
 
 @_parse_latex.register(LatexSpecialsNode)
 def _specials_node(node: LatexSpecialsNode,
                    nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    yield node.specials_chars
+    return [node.specials_chars]
 
 
 @_parse_latex.register(LatexGroupNode)
 def _group_node(node: LatexGroupNode,
-                nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    yield from _parse_latex_nodes(iter(node.nodelist), nodes_to_text)
+                nodes_to_text: LatexNodes2Text) -> _LatexFrame:
+    return _LatexFrame(iter(node.nodelist), None, True)
 
 
 @_parse_latex.register(LatexCommentNode)
 def _comment(node: LatexCommentNode,
              nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    return iter(())
+    return []
 
 
 @_parse_latex.register(LatexMacroNode)
-def _macro(node: LatexMacroNode,
-           nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-
+def _macro(node: LatexMacroNode, nodes_to_text: LatexNodes2Text
+           ) -> Union[Iterable[Text], _LatexFrame]:
     style: Optional[Callable[[Text], Text]] = style_map.get(node.macroname)
     if style is not None and len(node.nodeargd.argnlist) == 1:
-        yield style(_smart_join(
-            _parse_latex(node.nodeargd.argnlist[0], nodes_to_text)))
+        return _LatexFrame(iter(node.nodeargd.argnlist), style, False)
     else:
         text = nodes_to_text.node_to_text(node)
-        if text:
-            yield text
+        return [text] if text else []
 
 
 @_parse_latex.register(LatexMathNode)
 def _math(node: LatexMathNode,
-          nodes_to_text: LatexNodes2Text) -> Iterable[Text]:
-    for child_node in node.nodelist:
-        yield from _parse_latex(child_node, nodes_to_text)
+          nodes_to_text: LatexNodes2Text) -> _LatexFrame:
+    return _LatexFrame(iter(node.nodelist), None, False)
@@ -1,13 +1,19 @@
+import dataclasses
 import html
 from enum import Enum
-from xml.etree.ElementTree import Element
-from typing import List, Iterable, Dict, Optional, Type, Any
+from functools import lru_cache
+from xml.etree.ElementTree import Element, iterparse
+from typing import (
+    List, Iterable, Iterator, Dict, NamedTuple, Optional, Tuple, Type, Any,
+    BinaryIO, Union
+)
 
 from rite.richtext import (
     Text, Join,
     Semantics, FontStyles, FontVariants, FontSizes, FontSize, Semantic,
     FontStyle, FontVariant, FontWeight
 )
+from rite.richtext.utils import text_normalize, texts_normalize
 
 
 def unescape(value: str) -> str:
@@ -29,26 +35,52 @@ def style_attrib(attrib: Dict[str, str], name: str) -> Optional[str]:
     return dict(part.partition(':')[::2] for part in parts).get(name)
 
 
+class ElementStyle(NamedTuple):
+    """Rich style of an element, from its tag and style attribute."""
+    font_size: Optional[FontSizes]
+    font_style: Optional[FontStyles]
+    font_variant: Optional[FontVariants]
+    font_weight: Optional[int]
+
+
+@lru_cache(maxsize=256)
+def _resolve_style(style: str, italic: bool, bold: bool) -> ElementStyle:
+    """Parse a style attribute, in a single pass, falling back to
+    italic or bold if implied by the tag.
+    Real documents reuse few distinct style attributes, so cache these.
+    """
+    attrib = dict(part.partition(':')[::2] for part in style.split(";"))
+    size = attrib.get("font-size")
+    font_style = attrib.get("font-style")
+    variant = attrib.get("font-variant")
+    weight = attrib.get("font-weight")
+    return ElementStyle(
+        _font_size_map.get(size) if size is not None else None,
+        (_font_style_map.get(font_style) if font_style is not None
+         else (FontStyles.ITALIC if italic else None)),
+        _font_variant_map.get(variant) if variant is not None else None,
+        int(weight) if weight is not None else (700 if bold else None))
+
+
+def element_style(element: Element) -> ElementStyle:
+    return _resolve_style(element.attrib.get("style", ""),
+                          element.tag == 'i', element.tag == 'b')
+
+
 def element_font_size(element: Element) -> Optional[FontSizes]:
-    size = style_attrib(element.attrib, "font-size")
-    return _font_size_map.get(size) if size is not None else None
+    return element_style(element).font_size
 
 
 def element_font_style(element: Element) -> Optional[FontStyles]:
-    style = style_attrib(element.attrib, "font-style")
-    return (_font_style_map.get(style) if style is not None
-            else (FontStyles.ITALIC if element.tag == 'i' else None))
+    return element_style(element).font_style
 
 
 def element_font_variant(element: Element) -> Optional[FontVariants]:
-    variant = style_attrib(element.attrib, "font-variant")
-    return _font_variant_map.get(variant) if variant is not None else None
+    return element_style(element).font_variant
 
 
 def element_font_weight(element: Element) -> Optional[int]:
-    weight = style_attrib(element.attrib, "font-weight")
-    return (int(weight) if weight is not None
-            else (700 if element.tag == 'b' else None))
+    return element_style(element).font_weight
 
 
 def text_from_list(texts: List[Text]) -> Text:
@@ -60,31 +92,93 @@ def text_from_list(texts: List[Text]) -> Text:
         return ''
 
 
+def style_texts(element: Element, children: List[Text]) -> List[Text]:
+    """Embed the texts of the children of the element
+    in the rich style of the element.
+    """
+    semantic = _semantics_map.get(element.tag)
+    if semantic is not None:
+        children = [Semantic(text_from_list(children), semantic)]
+    style = element_style(element)
+    if style.font_size is not None:
+        children = [FontSize(text_from_list(children), style.font_size)]
+    if style.font_style is not None:
+        children = [FontStyle(text_from_list(children), style.font_style)]
+    if style.font_variant is not None:
+        children = [FontVariant(text_from_list(children), style.font_variant)]
+    if style.font_weight is not None:
+        children = [FontWeight(text_from_list(children), style.font_weight)]
+    return children
+
+
+def _element_head(element: Element) -> List[Text]:
+    return [unescape(element.text)] if element.text else []
+
+
+def _parse_xml(element: Element, tail: bool = True) -> List[Text]:
+    """Texts of the element, and of its tail if *tail* is set,
+    using an explicit stack rather than recursion.
+    """
+    texts: List[Text] = []
+    # elements, with their remaining sub elements, and their texts so far
+    stack: List[Tuple[Element, Iterator[Element], List[Text]]] = [
+        (element, iter(element), _element_head(element))]
+    while stack:
+        parent, sub_elements, children = stack[-1]
+        sub_element: Optional[Element] = next(sub_elements, None)
+        if sub_element is not None:
+            stack.append((sub_element, iter(sub_element),
+                          _element_head(sub_element)))
+            continue
+        stack.pop()
+        parent_texts = stack[-1][2] if stack else texts
+        parent_texts.extend(style_texts(parent, children))
+        if parent.tail and (stack or tail):
+            parent_texts.append(unescape(parent.tail))
+    return texts
+
+
+@dataclasses.dataclass(frozen=True)
 class ParseXml:
+    normalize: bool = False  #: Normalize the parsed text.
+
     def __call__(self, element: Element) -> Iterable[Text]:
-        # parse children
-        children: List[Text] = []
-        if element.text:
-            children.append(unescape(element.text))
-        for sub_element in element:
-            children.extend(self(sub_element))
-        # embed in rich style if need be
-        semantic = _semantics_map.get(element.tag)
-        if semantic is not None:
-            children = [Semantic(text_from_list(children), semantic)]
-        font_size = element_font_size(element)
-        if font_size is not None:
-            children = [FontSize(text_from_list(children), font_size)]
-        font_style = element_font_style(element)
-        if font_style is not None:
-            children = [FontStyle(text_from_list(children), font_style)]
-        font_variant = element_font_variant(element)
-        if font_variant is not None:
-            children = [FontVariant(text_from_list(children), font_variant)]
-        font_weight = element_font_weight(element)
-        if font_weight is not None:
-            children = [FontWeight(text_from_list(children), font_weight)]
-        yield from children
-        # return the tail
-        if element.tail:
-            yield unescape(element.tail)
+        texts = _parse_xml(element)
+        return texts_normalize(texts) if self.normalize else texts
+
+
+@dataclasses.dataclass(frozen=True)
+class ParseXmlRecords:
+    """Parse a large XML document incrementally, with
+    :func:`~xml.etree.ElementTree.iterparse`, into one text per record,
+    as soon as the record closes.
+    Processed elements are removed from the tree,
+    so memory scales with the size of the records,
+    rather than with the size of the document.
+    """
+    tag: str  #: Tag of the record elements.
+    normalize: bool = False  #: Normalize the parsed text.
+
+    def __call__(self, source: Union[str, BinaryIO]) -> Iterable[Text]:
+        """Texts of the records in the XML file
+        with the given name, or from the given binary file.
+        """
+        # open elements, and the number of open records among them
+        stack: List[Element] = []
+        records = 0
+        for event, element in iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                records += element.tag == self.tag
+                continue
+            stack.pop()
+            if element.tag == self.tag:
+                records -= 1
+                if not records:
+                    text = text_from_list(_parse_xml(element, tail=False))
+                    yield text_normalize(text) if self.normalize else text
+            if not records:
+                # element is processed, so drop it
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
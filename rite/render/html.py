@@ -1,11 +1,12 @@
 import html
 
 from functools import singledispatch
-from typing import Iterable
+from typing import Iterable, Tuple, List
 
 from rite.render.xml import text_style_property
-from rite.richtext import Text, Child, Join, Semantic
-from rite.richtext.utils import text_iter
+from rite.richtext import Text, Child, Semantic, BaseText, Event
+from rite.richtext.tape import Tape
+from rite.richtext.utils import text_events
 
 
 def escape(value: str) -> str:
@@ -13,12 +14,12 @@ def escape(value: str) -> str:
 
 
 @singledispatch
-def _render_html(text: Text) -> Iterable[str]:
-    yield from map(escape, text_iter(text))
+def _html_tags(text: BaseText) -> Tuple[str, str]:
+    return '', ''
 
 
-@_render_html.register(Child)
-def _child(text: Child) -> Iterable[str]:
+@_html_tags.register(Child)
+def _child_tags(text: Child) -> Tuple[str, str]:
     tag = text.semantic.value if isinstance(text, Semantic) else "span"
     style_property = text_style_property(text)
     if style_property is not None:
@@ -29,19 +30,40 @@ def _child(text: Child) -> Iterable[str]:
         if start == '<span style="font-style:italic">':
             start = '<i>'
             tag = 'i'
-        yield start
     else:
-        yield f"<{tag}>"
-    yield from _render_html(text.child)
-    yield f"</{tag}>"
+        start = f"<{tag}>"
+    return start, f"</{tag}>"
+
+
+def _render_html_events(events: Iterable[Event]) -> Iterable[str]:
+    ends: List[str] = []
+    for event in events:
+        if isinstance(event, str):
+            yield escape(event)
+        elif event is None:
+            yield ends.pop()
+        else:
+            start, end = _html_tags(event)
+            ends.append(end)
+            yield start
+
 
+@singledispatch
+def _render_html(text: Text) -> Iterable[str]:
+    return _render_html_events(text_events(text))
 
-@_render_html.register(Join)
-def _join(text: Join) -> Iterable[str]:
-    for child in text.children:
-        yield from _render_html(child)
+
+@_render_html.register(Tape)
+def _tape(text: Tape) -> Iterable[str]:
+    return _render_html_events(text.events())
 
 
 class RenderHtml:
     def __call__(self, text: Text) -> Iterable[str]:
         return _render_html(text)
+
+    def render_events(self, events: Iterable[Event]) -> Iterable[str]:
+        """Render a flat stream of events, as from
+        :func:`rite.richtext.utils.text_events`.
+        """
+        return _render_html_events(events)
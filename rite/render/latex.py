@@ -1,14 +1,14 @@
 from functools import singledispatch
-from itertools import chain
-from typing import Iterable, Dict, Optional, TypeVar
+from typing import Iterable, Dict, Optional, TypeVar, Tuple, List
 
 from pylatexenc.latexencode import unicode_to_latex
 
 from rite.richtext import (
     Text, Semantics, FontSizes, FontStyles, FontVariants, Child,
-    Semantic, FontSize, FontStyle, FontVariant, FontWeight, BaseText
+    Semantic, FontSize, FontStyle, FontVariant, FontWeight, Event
 )
-from rite.richtext.utils import text_iter
+from rite.richtext.tape import Tape
+from rite.richtext.utils import text_events
 
 
 semantics_map: Dict[Semantics, str] = {
@@ -71,30 +71,46 @@ def style_macro(text: Child) -> Optional[str]:
     return None
 
 
-@singledispatch
-def _render_latex(text: Text) -> Iterable[str]:
-    for part in text_iter(text):
-        yield unicode_to_latex(part)
+def style_tags(text: Child) -> Tuple[str, str]:
+    cmd = style_command(text)
+    if cmd is not None:
+        return f"\\{cmd}{{", "}"
+    mac = style_macro(text)
+    if mac is not None:
+        return f"{{\\{mac} ", "}"
+    return '', ''
 
 
-@_render_latex.register(BaseText)
-def _base(text: BaseText) -> Iterable[str]:
-    return chain.from_iterable(map(_render_latex, text))
+def _render_latex_events(events: Iterable[Event]) -> Iterable[str]:
+    ends: List[str] = []
+    for event in events:
+        if isinstance(event, str):
+            yield unicode_to_latex(event)
+        elif event is None:
+            yield ends.pop()
+        else:
+            start, end = (style_tags(event) if isinstance(event, Child)
+                          else ('', ''))
+            ends.append(end)
+            yield start
 
 
-@_render_latex.register(Child)
-def _child(text: Child) -> Iterable[str]:
-    cmd = style_command(text)
-    mac = style_macro(text)
-    if cmd is not None:
-        yield from ["\\", cmd, "{"]
-    elif mac is not None:
-        yield from ["{", "\\", mac, " "]
-    yield from _render_latex(text.child)
-    if cmd is not None or mac is not None:
-        yield "}"
+@singledispatch
+def _render_latex(text: Text) -> Iterable[str]:
+    return _render_latex_events(text_events(text))
+
+
+@_render_latex.register(Tape)
+def _tape(text: Tape) -> Iterable[str]:
+    return _render_latex_events(text.events())
 
 
 class RenderLatex:
     def __call__(self, text: Text) -> Iterable[str]:
         return _render_latex(text)
+
+    def render_events(self, events: Iterable[Event]) -> Iterable[str]:
+        """Render a flat stream of events, as from
+        :func:`rite.richtext.utils.text_events`.
+        """
+        return _render_latex_events(events)
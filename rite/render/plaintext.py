@@ -1,9 +1,24 @@
 from typing import Iterable
 
-from rite.richtext import Text
+from rite.richtext import Text, Event
+from rite.richtext.tape import Tape
 from rite.richtext.utils import text_iter
 
 
+def _render_plaintext_events(events: Iterable[Event]) -> Iterable[str]:
+    for event in events:
+        if isinstance(event, str):
+            yield event
+
+
 class RenderPlaintext:
     def __call__(self, text: Text) -> Iterable[str]:
+        if isinstance(text, Tape):
+            return _render_plaintext_events(text.events())
         return text_iter(text)
+
+    def render_events(self, events: Iterable[Event]) -> Iterable[str]:
+        """Render a flat stream of events, as from
+        :func:`rite.richtext.utils.text_events`.
+        """
+        return _render_plaintext_events(events)
@@ -1,11 +1,12 @@
 from functools import singledispatch
-from typing import Iterable, Dict, Tuple, Optional
+from typing import Iterable, Dict, Tuple, Optional, List
 
 from rite.richtext import (
-    Text, Join, Semantics, FontStyles, Child,
-    Semantic, FontStyle, FontWeight
+    Text, Semantics, FontStyles, Child,
+    Semantic, FontStyle, FontWeight, Event
 )
-from rite.richtext.utils import text_iter
+from rite.richtext.tape import Tape
+from rite.richtext.utils import text_events
 
 rst_tags: Dict[Semantics, Tuple[str, str]] = {
     Semantics.EMPHASIS: ('*', '*'),
@@ -37,27 +38,36 @@ def style_rst_tags(text: Child) -> Optional[Tuple[str, str]]:
     return None
 
 
-@singledispatch
-def _render_rst(text: Text) -> Iterable[str]:
-    yield from map(escape, text_iter(text))
+def _render_rst_events(events: Iterable[Event]) -> Iterable[str]:
+    ends: List[str] = []
+    for event in events:
+        if isinstance(event, str):
+            yield escape(event)
+        elif event is None:
+            yield ends.pop()
+        else:
+            tags = style_rst_tags(event) if isinstance(event, Child) else None
+            start, end = tags if tags is not None else ('', '')
+            ends.append(end)
+            yield start
 
 
-@_render_rst.register(Child)
-def _rich(text: Child) -> Iterable[str]:
-    tags = style_rst_tags(text)
-    if tags is not None:
-        yield tags[0]
-    yield from _render_rst(text.child)
-    if tags is not None:
-        yield tags[1]
+@singledispatch
+def _render_rst(text: Text) -> Iterable[str]:
+    return _render_rst_events(text_events(text))
 
 
-@_render_rst.register(Join)
-def _join(text: Join) -> Iterable[str]:
-    for child in text.children:
-        yield from _render_rst(child)
+@_render_rst.register(Tape)
+def _tape(text: Tape) -> Iterable[str]:
+    return _render_rst_events(text.events())
 
 
 class RenderRst:
     def __call__(self, text: Text) -> Iterable[str]:
         return _render_rst(text)
+
+    def render_events(self, events: Iterable[Event]) -> Iterable[str]:
+        """Render a flat stream of events, as from
+        :func:`rite.richtext.utils.text_events`.
+        """
+        return _render_rst_events(events)
@@ -5,10 +5,11 @@ from typing import Iterable, Optional, List, Tuple
 from xml.etree.ElementTree import Element
 
 from rite.richtext import (
-    Text, Join, Semantic, FontSize, FontStyle, FontVariant, FontWeight,
-    Child, FontStyles
+    Text, Semantic, FontSize, FontStyle, FontVariant, FontWeight,
+    Child, FontStyles, Event
 )
-from rite.richtext.utils import text_iter
+from rite.richtext.tape import Tape
+from rite.richtext.utils import text_events
 
 
 def escape(value: str) -> str:
@@ -27,69 +28,82 @@ def text_style_property(text: Child) -> Optional[str]:
     return None
 
 
-# generates a string sequence followed by one or more xml elements
-# strings in between elements are in the "tail" attribute of each element
 @singledispatch
-def _render_xml(text: Text) -> Tuple[Optional[str], Iterable[Element]]:
-    return ''.join(map(escape, text_iter(text))), []
-
-
-@_render_xml.register(Join)
-def _join(text: Join) -> Tuple[Optional[str], Iterable[Element]]:
-    head_text: Optional[str] = None
-    children: List[Element] = []
-    for child in text.children:
-        child_text, child_children = _render_xml(child)
-        if child_text:
-            if children:
-                last_element = children[-1]
-                if last_element.tail is None:
-                    last_element.tail = child_text
-                else:
-                    last_element.tail += child_text
-            else:
-                if head_text is None:
-                    head_text = child_text
-                else:
-                    head_text += child_text
-        children.extend(child_children)
-    return head_text, children
-
-
-@_render_xml.register(Child)
-def _child(text: Child) -> Tuple[Optional[str], Iterable[Element]]:
+def _xml_element(text: Child) -> Element:
     element = Element(
         text.semantic.value if isinstance(text, Semantic) else "span")
     style_property = text_style_property(text)
     if style_property is not None:
         element.attrib["style"] = style_property
-    element.text, children = _render_xml(text.child)
-    element.extend(children)
-    return None, [element]
-
-
-@_render_xml.register(FontWeight)
-def _font_weight(text: FontWeight) -> Tuple[Optional[str], Iterable[Element]]:
-    if text.font_weight == 700:
-        element = Element('b')
-        element.text, children = _render_xml(text.child)
-        element.extend(children)
-        return None, [element]
-    else:
-        return _child(text)
+    return element
+
+
+@_xml_element.register(FontWeight)
+def _font_weight_element(text: FontWeight) -> Element:
+    return Element('b') if text.font_weight == 700 else _child_element(text)
+
+
+@_xml_element.register(FontStyle)
+def _font_style_element(text: FontStyle) -> Element:
+    return (Element('i') if text.font_style == FontStyles.ITALIC
+            else _child_element(text))
+
+
+_child_element = _xml_element.dispatch(Child)
 
 
-@_render_xml.register(FontStyle)
-def _font_style(text: FontStyle) -> Tuple[Optional[str], Iterable[Element]]:
-    if text.font_style == FontStyles.ITALIC:
-        element = Element('i')
-        element.text, children = _render_xml(text.child)
-        element.extend(children)
-        return None, [element]
+def _append_text(element: Element, value: str) -> None:
+    if len(element):
+        last_element = element[-1]
+        if last_element.tail is None:
+            last_element.tail = value
+        else:
+            last_element.tail += value
+    elif element.text is None:
+        element.text = value
     else:
-        return _child(text)
+        element.text += value
+
+
+def _render_xml_events(events: Iterable[Event]
+                       ) -> Tuple[Optional[str], Iterable[Element]]:
+    root = Element('root')
+    # stack of open elements, transparent nodes reuse their parent
+    stack: List[Element] = [root]
+    for event in events:
+        if isinstance(event, str):
+            if event:
+                _append_text(stack[-1], escape(event))
+        elif event is None:
+            stack.pop()
+        elif isinstance(event, Child):
+            element = _xml_element(event)
+            stack[-1].append(element)
+            stack.append(element)
+        else:
+            stack.append(stack[-1])
+    return root.text, list(root)
+
+
+# generates a string sequence followed by one or more xml elements
+# strings in between elements are in the "tail" attribute of each element
+@singledispatch
+def _render_xml(text: Text) -> Tuple[Optional[str], Iterable[Element]]:
+    return _render_xml_events(text_events(text))
+
+
+@_render_xml.register(Tape)
+def _tape(text: Tape) -> Tuple[Optional[str], Iterable[Element]]:
+    return _render_xml_events(text.events())
 
 
 class RenderXml:
     def __call__(self, text: Text) -> Tuple[Optional[str], Iterable[Element]]:
         return _render_xml(text)
+
+    def render_events(self, events: Iterable[Event]
+                      ) -> Tuple[Optional[str], Iterable[Element]]:
+        """Render a flat stream of events, as from
+        :func:`rite.richtext.utils.text_events`.
+        """
+        return _render_xml_events(events)
@@ -1,41 +1,145 @@
 import dataclasses
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Iterable, Iterator, Union
+from typing import Any, Iterable, Iterator, List, Union, Optional, Tuple
 
 Text = Union["BaseText", str]
 
+#: A flat rich text event: a string, the opening of a rich text node
+#: (whose children are ignored), or ``None`` to close the last opened node.
+Event = Optional[Text]
+
+_setattr = object.__setattr__
+
 
 class BaseText(ABC, Iterable[Text]):
     """Rich text is a collection of strings with some additional formatting
     attached to it.
+
+    Rich text is immutable. Its structural hash is computed once,
+    on construction, from the cached hashes of its children,
+    and is used as a fast path for equality tests.
+    Equality and representation use an explicit stack,
+    so there is no limit on the depth of the text.
     """
 
+    __slots__ = ('_hash',)
+    _hash: int
+
     @abstractmethod
     def replace(self, children: Iterable[Text]) -> "BaseText":
         raise NotImplementedError
 
+    @abstractmethod
+    def _key(self) -> Tuple[Any, ...]:
+        """Constructor arguments, used for equality, hashing, and pickling."""
+        raise NotImplementedError
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:  # subclass that does not set it on init
+            value = hash((type(self), *self._key()))
+            _setattr(self, '_hash', value)
+            return value
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        # pairs of values to compare, from the keys of equal hashed nodes
+        stack: List[Tuple[Any, Any]] = [(self, other)]
+        while stack:
+            value1, value2 = stack.pop()
+            if value1 is value2:
+                continue
+            elif isinstance(value1, BaseText):
+                if type(value1) is not type(value2) \
+                        or hash(value1) != hash(value2):
+                    return False
+                stack.extend(zip(value1._key(), value2._key()))
+            elif isinstance(value1, tuple):
+                if type(value2) is not tuple or len(value1) != len(value2):
+                    return False
+                stack.extend(zip(value1, value2))
+            elif value1 != value2:
+                return False
+        return True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise dataclasses.FrozenInstanceError(
+            f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise dataclasses.FrozenInstanceError(
+            f"cannot delete field {name!r}")
+
+    def __repr__(self) -> str:
+        # stack of values to represent, and of literal parts of the result
+        stack: List[Tuple[bool, Any]] = [(False, self)]
+        parts: List[str] = []
+        while stack:
+            literal, value = stack.pop()
+            if literal:
+                parts.append(value)
+            elif isinstance(value, (BaseText, tuple)):
+                values = value._key() if isinstance(value, BaseText) \
+                    else value
+                items: List[Tuple[bool, Any]] = [
+                    (True, f'{type(value).__name__}('
+                     if isinstance(value, BaseText) else '(')]
+                for i, item in enumerate(values):
+                    if i:
+                        items.append((True, ', '))
+                    items.append((False, item))
+                if type(value) is tuple and len(values) == 1:
+                    items.append((True, ','))
+                items.append((True, ')'))
+                stack.extend(reversed(items))
+            else:
+                parts.append(repr(value))
+        return ''.join(parts)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), self._key()
+
 
-@dataclasses.dataclass(frozen=True)
 class Join(BaseText):
-    children: List[Text]
+    __slots__ = ('children',)
+    children: Tuple[Text, ...]
+
+    def __init__(self, children: Iterable[Text]) -> None:
+        children = tuple(children)
+        _setattr(self, 'children', children)
+        _setattr(self, '_hash', hash((type(self), children)))
 
     def __iter__(self) -> Iterator[Text]:
         return iter(self.children)
 
+    def _key(self) -> Tuple[Any, ...]:
+        return self.children,
+
     def replace(self, children: Iterable[Text]) -> "BaseText":
-        return dataclasses.replace(self, children=list(children))
+        return type(self)(children)
 
 
-@dataclasses.dataclass(frozen=True)
 class Child(BaseText):
+    __slots__ = ('child',)
     child: Text
 
+    def __init__(self, child: Text) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, '_hash', hash((type(self), child)))
+
     def __iter__(self) -> Iterator[Text]:
-        yield self.child
+        return iter((self.child,))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child,
 
     def replace(self, children: Iterable[Text]) -> "BaseText":
-        return dataclasses.replace(self, child=next(iter(children)))
+        return type(self)(next(iter(children)), *self._key()[1:])
 
 
 class Semantics(Enum):
@@ -59,6 +163,8 @@ class Semantics(Enum):
     H6 = 'h6'
     PARAGRAPH = 'p'
 
+    __hash__ = object.__hash__  # members are singletons
+
 
 class FontSizes(Enum):
     MEDIUM = 'medium'
@@ -69,38 +175,84 @@ class FontSizes(Enum):
     X_LARGE = 'x-large'
     XX_LARGE = 'xx-large'
 
+    __hash__ = object.__hash__  # members are singletons
+
 
 class FontStyles(Enum):
     NORMAL = 'normal'
     ITALIC = 'italic'
     OBLIQUE = 'oblique'
 
+    __hash__ = object.__hash__  # members are singletons
+
 
 class FontVariants(Enum):
     NORMAL = 'normal'
     SMALL_CAPS = 'small-caps'
 
+    __hash__ = object.__hash__  # members are singletons
+
 
-@dataclasses.dataclass(frozen=True)
 class Semantic(Child):
+    __slots__ = ('semantic',)
     semantic: Semantics
 
+    def __init__(self, child: Text, semantic: Semantics) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, 'semantic', semantic)
+        _setattr(self, '_hash', hash((type(self), child, semantic)))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child, self.semantic
+
 
-@dataclasses.dataclass(frozen=True)
 class FontSize(Child):
+    __slots__ = ('font_size',)
     font_size: FontSizes
 
+    def __init__(self, child: Text, font_size: FontSizes) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, 'font_size', font_size)
+        _setattr(self, '_hash', hash((type(self), child, font_size)))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child, self.font_size
+
 
-@dataclasses.dataclass(frozen=True)
 class FontStyle(Child):
+    __slots__ = ('font_style',)
     font_style: FontStyles
 
+    def __init__(self, child: Text, font_style: FontStyles) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, 'font_style', font_style)
+        _setattr(self, '_hash', hash((type(self), child, font_style)))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child, self.font_style
+
 
-@dataclasses.dataclass(frozen=True)
 class FontVariant(Child):
+    __slots__ = ('font_variant',)
     font_variant: FontVariants
 
+    def __init__(self, child: Text, font_variant: FontVariants) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, 'font_variant', font_variant)
+        _setattr(self, '_hash', hash((type(self), child, font_variant)))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child, self.font_variant
+
 
-@dataclasses.dataclass(frozen=True)
 class FontWeight(Child):
+    __slots__ = ('font_weight',)
     font_weight: int  #: 400 = normal, 700 = bold
+
+    def __init__(self, child: Text, font_weight: int) -> None:
+        _setattr(self, 'child', child)
+        _setattr(self, 'font_weight', font_weight)
+        _setattr(self, '_hash', hash((type(self), child, font_weight)))
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.child, self.font_weight
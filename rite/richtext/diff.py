@@ -0,0 +1,151 @@
+import dataclasses
+from difflib import SequenceMatcher
+from typing import Hashable, Iterator, List, Optional, Tuple, Union
+
+from rite.richtext import Text, BaseText
+from rite.richtext.utils import text_style
+
+#: Position of a node, as the sequence of child indices from the root.
+Path = Tuple[int, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class Insert:
+    """Insert *text* so it becomes the child at *path*."""
+    path: Path
+    text: Text
+
+
+@dataclasses.dataclass(frozen=True)
+class Delete:
+    """Delete the child at *path*."""
+    path: Path
+
+
+@dataclasses.dataclass(frozen=True)
+class Replace:
+    """Replace the text at *path* by *text*."""
+    path: Path
+    text: Text
+
+
+@dataclasses.dataclass(frozen=True)
+class Restyle:
+    """Change the style of the node at *path* to that of *text*,
+    keeping its children.
+    """
+    path: Path
+    text: BaseText
+
+
+Edit = Union[Insert, Delete, Replace, Restyle]
+
+
+# a pair of subtrees to compare, at the given path, or an edit to emit
+_Action = Union[Tuple[Text, Text, Path], Edit]
+
+
+def text_diff(old: Text, new: Text) -> List[Edit]:
+    """Edit operations that turn *old* into *new*.
+    The operations are meant to be applied in order, see :func:`text_patch`,
+    and every path refers to the text as it is just before its operation.
+    Subtrees with equal type and structural hash are taken to be equal,
+    and skipped without being descended into, so only the changed parts
+    are visited. A hash collision could therefore hide a change,
+    which is the usual trade-off of hash based diffing.
+    Each operation carries the new subtree, which can be rendered
+    to update just that part of the output.
+    The texts are walked with an explicit stack, so there is no limit
+    on their depth.
+    """
+    edits: List[Edit] = []
+    stack: List[Iterator[_Action]] = [iter([(old, new, ())])]
+    while stack:
+        for action in stack[-1]:
+            if not isinstance(action, tuple):
+                edits.append(action)
+                continue
+            actions = _diff(*action)
+            if actions is not None:
+                stack.append(actions)
+                break
+        else:
+            stack.pop()
+    return edits
+
+
+def _token(text: Text) -> Hashable:
+    """Token which is equal for texts that are taken to be equal."""
+    return text if isinstance(text, str) else (type(text), hash(text))
+
+
+def _diff(old: Text, new: Text, path: Path) -> Optional[Iterator[_Action]]:
+    """Actions that turn *old* into *new*, if they differ."""
+    if old is new or _token(old) == _token(new):
+        return None
+    if isinstance(old, str) or isinstance(new, str):
+        return iter([Replace(path, new)])
+    old_children, new_children = tuple(old), tuple(new)
+    if text_style(old) == text_style(new):
+        return _diff_children(old_children, new_children, path)
+    elif list(map(_token, old_children)) == list(map(_token, new_children)):
+        assert isinstance(new, BaseText)
+        return iter([Restyle(path, new)])
+    else:
+        return iter([Replace(path, new)])
+
+
+def _diff_children(old: Tuple[Text, ...], new: Tuple[Text, ...],
+                   path: Path) -> Iterator[_Action]:
+    # once the opcodes up to (i1, j1) are applied, the children are
+    # new[:j1] + old[i1:], so old child i sits at index j1 + i - i1
+    matcher = SequenceMatcher(
+        None, list(map(_token, old)), list(map(_token, new)),
+        autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        common = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for k in range(common):
+            yield old[i1 + k], new[j1 + k], path + (j1 + k,)
+        for _ in range(i1 + common, i2):
+            yield Delete(path + (j1 + common,))
+        for j in range(j1 + common, j2):
+            yield Insert(path + (j,), new[j])
+
+
+def _apply(text: Text, edit: Edit) -> Text:
+    if not edit.path:
+        assert isinstance(edit, (Replace, Restyle))
+        return (edit.text if isinstance(edit, Replace)
+                else edit.text.replace(text))
+    # nodes along the path, from the root to the parent of the target
+    nodes: List[BaseText] = []
+    for i in edit.path[:-1]:
+        assert isinstance(text, BaseText)
+        nodes.append(text)
+        text = tuple(text)[i]
+    assert isinstance(text, BaseText)
+    children = list(text)
+    i = edit.path[-1]
+    if isinstance(edit, Insert):
+        children.insert(i, edit.text)
+    elif isinstance(edit, Delete):
+        del children[i]
+    elif isinstance(edit, Replace):
+        children[i] = edit.text
+    else:
+        children[i] = edit.text.replace(tuple(children[i]))
+    result: Text = text.replace(children)
+    for node, i in zip(reversed(nodes), reversed(edit.path[:-1])):
+        children = list(node)
+        children[i] = result
+        result = node.replace(children)
+    return result
+
+
+def text_patch(text: Text, edits: List[Edit]) -> Text:
+    """Apply the edit operations, as returned by :func:`text_diff`."""
+    for edit in edits:
+        text = _apply(text, edit)
+    return text
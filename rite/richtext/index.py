@@ -0,0 +1,144 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Tuple, Optional, Union
+
+from rite.richtext import Text, BaseText, Child
+
+# children of a node, with the offsets at which they start and end
+_Layout = Tuple[Tuple[Text, ...], List[int]]
+
+
+class TextIndex:
+    """Index of the plain text offsets of a rich text.
+    Building the index takes linear time. After that,
+    the length, the styles at an offset, and slices,
+    take time logarithmic in the number of children of each node
+    on the way down, rather than linear in the size of the text.
+    """
+
+    def __init__(self, text: Text) -> None:
+        self.text = text
+        self._layouts: Dict[int, _Layout] = {}
+        self._len = self._build(text)
+
+    def _build(self, text: Text) -> int:
+        if isinstance(text, str):
+            return len(text)
+        # stack of nodes, their children, and the lengths found so far
+        stack: List[Tuple[BaseText, Tuple[Text, ...], List[int]]] = [
+            (text, tuple(text), [])]
+        while True:
+            node, children, lengths = stack[-1]
+            while len(lengths) < len(children):
+                child = children[len(lengths)]
+                if isinstance(child, str):
+                    lengths.append(len(child))
+                elif id(child) in self._layouts:  # shared node
+                    lengths.append(self._layouts[id(child)][1][-1])
+                else:
+                    stack.append((child, tuple(child), []))
+                    break
+            else:
+                stack.pop()
+                offsets = [0, *accumulate(lengths)]
+                self._layouts[id(node)] = children, offsets
+                if not stack:
+                    return offsets[-1]
+                stack[-1][2].append(offsets[-1])
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: Union[int, slice]) -> Text:
+        """The character at an integer *index*, or the part of the text
+        in a *slice*, keeping all styles.
+        """
+        if isinstance(index, int):
+            if index < 0:
+                index += self._len
+            if not 0 <= index < self._len:
+                raise IndexError('text index out of range')
+            return self.slice(index, index + 1)
+        if not isinstance(index, slice):
+            raise TypeError(
+                f'text indices must be integers or slices,'
+                f' not {type(index).__name__}')
+        if index.step not in (None, 1):
+            raise ValueError('slice step must be 1')
+        start, stop, _ = index.indices(self._len)
+        return self.slice(start, stop)
+
+    def styles_at(self, offset: int) -> List[Child]:
+        """The styled nodes that apply to the character at *offset*,
+        from outermost to innermost.
+        """
+        if not 0 <= offset < self._len:
+            raise IndexError('text offset out of range')
+        styles: List[Child] = []
+        text = self.text
+        while not isinstance(text, str):
+            if isinstance(text, Child):
+                styles.append(text)
+            children, offsets = self._layouts[id(text)]
+            i = bisect_right(offsets, offset) - 1
+            offset -= offsets[i]
+            text = children[i]
+        return styles
+
+    def slice(self, start: int, stop: int) -> Text:
+        """The part of the text between offsets *start* and *stop*,
+        keeping all styles. Nodes fully inside the range are reused.
+        """
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        if start >= stop:
+            return ''
+        if start == 0 and stop == self._len:
+            return self.text
+        if isinstance(self.text, str):
+            return self.text[start:stop]
+        return self._slice(self.text, start, stop)
+
+    def _slice(self, text: BaseText, start: int, stop: int) -> Text:
+        # stack of partially overlapping nodes, each with the range relative
+        # to the node, the index of its next child, and its sliced children
+        stack: List[Tuple[BaseText, int, int, List[int], List[Text]]] = []
+        node: Optional[BaseText] = text
+        while node is not None or stack:
+            if node is not None:
+                _, offsets = self._layouts[id(node)]
+                first = bisect_right(offsets, start) - 1
+                stack.append((node, start, stop, [first], []))
+            node = None
+            parent, start, stop, position, results = stack[-1]
+            children, offsets = self._layouts[id(parent)]
+            while node is None and position[0] < len(children):
+                i = position[0]
+                position[0] += 1
+                child = children[i]
+                child_start, child_stop = offsets[i], offsets[i + 1]
+                if child_stop <= start or child_start == child_stop:
+                    continue
+                if child_start >= stop:
+                    position[0] = len(children)
+                elif start <= child_start and child_stop <= stop:
+                    results.append(child)
+                elif isinstance(child, str):
+                    results.append(
+                        child[max(start - child_start, 0):stop - child_start])
+                else:
+                    node = child
+                    start = max(start - child_start, 0)
+                    stop = stop - child_start
+            if node is None:
+                stack.pop()
+                result = parent.replace(results)
+                if not stack:
+                    return result
+                stack[-1][4].append(result)
+        raise AssertionError('unreachable')  # pragma: no cover
+
+
+def text_slice(text: Text, start: int, stop: int) -> Text:
+    """The part of *text* between offsets *start* and *stop*."""
+    return TextIndex(text).slice(start, stop)
@@ -0,0 +1,171 @@
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from rite.richtext import BaseText, Text, _setattr
+
+
+class _RopeNode:
+    """Internal node of a rope, balanced by height as in an AVL tree.
+    Leaves are the texts themselves.
+    """
+    __slots__ = ('left', 'right', 'size', 'height')
+
+    def __init__(self, left: "_Tree", right: "_Tree") -> None:
+        self.left = left
+        self.right = right
+        self.size = _size(left) + _size(right)
+        self.height = max(_height(left), _height(right)) + 1
+
+
+_Tree = Union[_RopeNode, Text]
+
+
+def _size(tree: _Tree) -> int:
+    return tree.size if isinstance(tree, _RopeNode) else 1
+
+
+def _height(tree: _Tree) -> int:
+    return tree.height if isinstance(tree, _RopeNode) else 0
+
+
+def _build(texts: List[Text], start: int, stop: int) -> _Tree:
+    """Perfectly balanced tree for a non-empty range of texts."""
+    if stop - start == 1:
+        return texts[start]
+    middle = (start + stop) // 2
+    return _RopeNode(_build(texts, start, middle), _build(texts, middle, stop))
+
+
+def _balance(left: _Tree, right: _Tree) -> _RopeNode:
+    """Node from trees whose heights differ by at most two."""
+    height_left = _height(left)
+    height_right = _height(right)
+    if height_left > height_right + 1:
+        assert isinstance(left, _RopeNode)
+        if _height(left.left) >= _height(left.right):
+            return _RopeNode(left.left, _RopeNode(left.right, right))
+        inner = left.right
+        assert isinstance(inner, _RopeNode)
+        return _RopeNode(_RopeNode(left.left, inner.left),
+                         _RopeNode(inner.right, right))
+    elif height_right > height_left + 1:
+        assert isinstance(right, _RopeNode)
+        if _height(right.right) >= _height(right.left):
+            return _RopeNode(_RopeNode(left, right.left), right.right)
+        inner = right.left
+        assert isinstance(inner, _RopeNode)
+        return _RopeNode(_RopeNode(left, inner.left),
+                         _RopeNode(inner.right, right.right))
+    return _RopeNode(left, right)
+
+
+def _concat(left: _Tree, right: _Tree) -> _RopeNode:
+    """Concatenate two trees, in time proportional to their height
+    difference.
+    """
+    height_left = _height(left)
+    height_right = _height(right)
+    if height_left > height_right + 1:
+        assert isinstance(left, _RopeNode)
+        return _balance(left.left, _concat(left.right, right))
+    elif height_right > height_left + 1:
+        assert isinstance(right, _RopeNode)
+        return _balance(_concat(left, right.left), right.right)
+    return _RopeNode(left, right)
+
+
+def _split(tree: _Tree, index: int) -> Tuple[_Tree, _Tree]:
+    """Split a tree into its first *index* texts and the rest,
+    where ``0 < index < _size(tree)``.
+    """
+    assert isinstance(tree, _RopeNode)
+    size_left = _size(tree.left)
+    if index == size_left:
+        return tree.left, tree.right
+    elif index < size_left:
+        left, right = _split(tree.left, index)
+        return left, _concat(right, tree.right)
+    else:
+        left, right = _split(tree.right, index - size_left)
+        return _concat(tree.left, left), right
+
+
+class Rope(BaseText):
+    """A join stored as a balanced tree, so that concatenation,
+    splitting, and indexing take logarithmic time in the number of
+    children. Use this instead of :class:`Join` to assemble
+    large documents piece by piece.
+    """
+    __slots__ = ('_tree',)
+    _tree: Optional[_Tree]
+
+    def __init__(self, children: Iterable[Text] = ()) -> None:
+        texts = list(children)
+        _setattr(self, '_tree', _build(texts, 0, len(texts)) if texts
+                 else None)
+
+    @classmethod
+    def _from_tree(cls, tree: Optional[_Tree]) -> "Rope":
+        rope = cls.__new__(cls)
+        _setattr(rope, '_tree', tree)
+        return rope
+
+    def __iter__(self) -> Iterator[Text]:
+        stack: List[_Tree] = [] if self._tree is None else [self._tree]
+        while stack:
+            tree = stack.pop()
+            if isinstance(tree, _RopeNode):
+                stack.append(tree.right)
+                stack.append(tree.left)
+            else:
+                yield tree
+
+    def __len__(self) -> int:
+        return 0 if self._tree is None else _size(self._tree)
+
+    def __getitem__(self, index: int) -> Text:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('rope index out of range')
+        tree = self._tree
+        while isinstance(tree, _RopeNode):
+            size_left = _size(tree.left)
+            if index < size_left:
+                tree = tree.left
+            else:
+                tree = tree.right
+                index -= size_left
+        assert tree is not None
+        return tree
+
+    def __add__(self, other: "Rope") -> "Rope":
+        if not isinstance(other, Rope):
+            return NotImplemented
+        if self._tree is None:
+            return other
+        if other._tree is None:
+            return self
+        return self._from_tree(_concat(self._tree, other._tree))
+
+    def append(self, text: Text) -> "Rope":
+        """Rope with *text* added as last child."""
+        if self._tree is None:
+            return self._from_tree(text)
+        return self._from_tree(_concat(self._tree, text))
+
+    def split(self, index: int) -> Tuple["Rope", "Rope"]:
+        """Ropes with the first *index* children and the remaining ones."""
+        if index <= 0:
+            return self._from_tree(None), self
+        if index >= len(self):
+            return self, self._from_tree(None)
+        assert self._tree is not None
+        left, right = _split(self._tree, index)
+        return self._from_tree(left), self._from_tree(right)
+
+    def _key(self) -> Tuple[Any, ...]:
+        return tuple(self),
+
+    def replace(self, children: Iterable[Text]) -> "BaseText":
+        return type(self)(children)
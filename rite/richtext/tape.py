@@ -0,0 +1,115 @@
+from array import array
+from typing import (
+    Any, Iterable, Iterator, List, Dict, Tuple, Optional, TypeVar
+)
+
+from rite.richtext import BaseText, Join, Text, Event, _setattr
+from rite.richtext.utils import text_style
+
+T = TypeVar('T')
+
+_CLOSE = -1
+
+
+def _intern(pool: List[T], index: Dict[T, int], value: T) -> int:
+    """Index of *value* in *pool*, appending it if it is not there yet."""
+    try:
+        i = index.setdefault(value, len(pool))
+    except TypeError:  # unhashable value, fall back to a linear search
+        i = pool.index(value) if value in pool else len(pool)
+    if i == len(pool):
+        pool.append(value)
+    return i
+
+
+class Tape(BaseText):
+    """Rich text stored as a flat tape of opcodes rather than as a tree.
+
+    Opcode ``2 * i`` emits ``strings[i]``,
+    opcode ``2 * i + 1`` opens ``styles[i]``,
+    and opcode ``-1`` closes the last opened style.
+    Like :class:`Join`, the top level of a tape is a sequence of texts.
+    Use :func:`tape_encode` to construct a tape.
+    """
+    __slots__ = ('ops', 'strings', 'styles')
+    ops: array
+    strings: Tuple[str, ...]
+    styles: Tuple[BaseText, ...]
+
+    def __init__(self, ops: array, strings: Tuple[str, ...],
+                 styles: Tuple[BaseText, ...]) -> None:
+        _setattr(self, 'ops', ops)
+        _setattr(self, 'strings', strings)
+        _setattr(self, 'styles', styles)
+
+    def _key(self) -> Tuple[Any, ...]:
+        return self.ops, self.strings, self.styles
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            value = hash((type(self), self.ops.tobytes(),
+                          self.strings, self.styles))
+            _setattr(self, '_hash', value)
+            return value
+
+    def __iter__(self) -> Iterator[Text]:
+        stack: List[Tuple[Optional[BaseText], List[Text]]] = [(None, [])]
+        for event in self.events():
+            if event is None:
+                style, children = stack.pop()
+                assert style is not None
+                stack[-1][1].append(style.replace(children))
+            elif isinstance(event, str):
+                stack[-1][1].append(event)
+            else:
+                stack.append((event, []))
+            if len(stack) == 1 and stack[0][1]:
+                yield stack[0][1].pop()
+
+    def replace(self, children: Iterable[Text]) -> "BaseText":
+        return tape_encode(children)
+
+    def events(self) -> Iterator[Event]:
+        """Iterate over the events encoded by the tape, in one linear pass."""
+        strings = self.strings
+        styles = self.styles
+        for op in self.ops:
+            if op == _CLOSE:
+                yield None
+            elif op & 1:
+                yield styles[op >> 1]
+            else:
+                yield strings[op >> 1]
+
+
+def tape_encode(texts: Iterable[Text]) -> Tape:
+    """Encode a sequence of rich texts as a tape."""
+    ops = array('i')
+    strings: List[str] = []
+    string_index: Dict[str, int] = {}
+    styles: List[BaseText] = []
+    style_index: Dict[BaseText, int] = {}
+    stack: List[Iterator[Text]] = [iter(texts)]
+    while stack:
+        text = next(stack[-1], None)
+        if text is None:
+            stack.pop()
+            if stack:
+                ops.append(_CLOSE)
+        elif isinstance(text, str):
+            ops.append(2 * _intern(strings, string_index, text))
+        else:
+            ops.append(2 * _intern(styles, style_index, text_style(text)) + 1)
+            stack.append(iter(text))
+    return Tape(ops, tuple(strings), tuple(styles))
+
+
+def tape_decode(tape: Tape) -> Text:
+    """Decode a tape back into a rich text tree.
+    A tape holding a single text decodes to that text,
+    otherwise the texts are joined.
+    """
+    texts = list(tape)
+    return texts[0] if len(texts) == 1 else Join(texts)
@@ -1,30 +1,104 @@
+import operator
 import string
-from itertools import repeat, takewhile
-from typing import Callable, TypeVar, List, Optional, Iterator, Iterable
+from itertools import islice, repeat
+from typing import (
+    Callable, TypeVar, List, Optional, Iterator, Iterable, Tuple
+)
 
-from rite.richtext import Text
+from rite.richtext import (
+    Text, BaseText, Event, Join, Child,
+    FontSize, FontStyle, FontVariant, FontWeight
+)
 
 T = TypeVar('T')
 
 
+def text_events(text: Text) -> Iterator[Event]:
+    """Flatten *text* into a sequence of events, in depth first order.
+    Uses an explicit stack, so there is no limit on the depth of *text*.
+    """
+    stack: List[Iterator[Text]] = [iter((text,))]
+    while stack:
+        for child in stack[-1]:
+            yield child
+            if not isinstance(child, str):
+                stack.append(iter(child))
+                break
+        else:
+            stack.pop()
+            if stack:
+                yield None
+
+
+def text_fold(text: Text, func_str: Callable[[str], T],
+              func_node: Callable[[BaseText, List[T]], T]) -> T:
+    """Fold *text* bottom up: strings are mapped by *func_str*,
+    and nodes by *func_node* from the node and its folded children.
+    Uses an explicit stack, so there is no limit on the depth of *text*.
+    """
+    if isinstance(text, str):
+        return func_str(text)
+    # stack of nodes being folded, with their remaining and folded children
+    stack: List[Tuple[BaseText, Iterator[Text], List[T]]] = [
+        (text, iter(text), [])]
+    while True:
+        node, children, results = stack[-1]
+        for child in children:
+            if isinstance(child, str):
+                results.append(func_str(child))
+            else:
+                stack.append((child, iter(child), []))
+                break
+        else:
+            stack.pop()
+            result = func_node(node, results)
+            if not stack:
+                return result
+            stack[-1][2].append(result)
+
+
+def _replace(text: BaseText, children: List[Text]) -> Text:
+    return text.replace(children)
+
+
+def _replace_changed(text: BaseText, children: List[Text]) -> Text:
+    """Like :meth:`BaseText.replace`, but reuses *text* if *children*
+    are the very same objects as its current children.
+    """
+    old_children = tuple(text)
+    if len(old_children) == len(children) \
+            and all(map(operator.is_, old_children, children)):
+        return text
+    return text.replace(children)
+
+
 def text_fmap_iter(text: Text, funcs: Iterator[Callable[[str], str]]
                    ) -> Text:
-    if isinstance(text, str):
-        return next(funcs)(text)
-    else:
-        return text.replace(text_fmap_iter(child, funcs) for child in text)
+    return text_fold(text, lambda value: next(funcs)(value), _replace)
 
 
 def text_fmap(func: Callable[[str], str], text: Text) -> Text:
     return text_fmap_iter(text, repeat(func))
 
 
+def text_style(text: BaseText) -> BaseText:
+    """Copy of *text* with its children stripped, so only its style
+    remains. Texts have equal style if and only if these copies are equal.
+    """
+    return text.replace([''] if isinstance(text, Child) else [])
+
+
 def text_iter(text: Text) -> Iterable[str]:
-    if isinstance(text, str):
-        yield text
-    else:
-        for child in text:
-            yield from text_iter(child)
+    stack: List[Iterator[Text]] = [iter((text,))]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, str):
+                yield child
+            else:
+                stack.append(iter(child))
+                break
+        else:
+            stack.pop()
 
 
 def text_raw(text: Text) -> str:
@@ -43,63 +117,149 @@ def text_is_lower(text: Text) -> bool:
     return text_raw(text).islower()
 
 
+def text_transform(func: Callable[[str, int, str], str], text: Text
+                   ) -> Text:
+    """Transform all strings of *text* in a single pass.
+    Each string is mapped by *func*, which also receives the number of
+    characters preceding the string, and the last of those characters
+    (or the empty string if there is none).
+    This allows rules such as "first character" or "start of word"
+    to work across node boundaries.
+    Nodes in which no string changed are reused.
+    """
+    offset = 0
+    last = ''
+
+    def func_str(value: str) -> str:
+        nonlocal offset, last
+        result = func(value, offset, last)
+        if value:
+            offset += len(value)
+            last = value[-1]
+        return value if result == value else result
+
+    return text_fold(text, func_str, _replace_changed)
+
+
+def _upper(value: str, offset: int, last: str) -> str:
+    return value.upper()
+
+
+def _lower(value: str, offset: int, last: str) -> str:
+    return value.lower()
+
+
+def _capitalize(value: str, offset: int, last: str) -> str:
+    return value.capitalize() if offset == 0 else value.lower()
+
+
+def _capfirst(value: str, offset: int, last: str) -> str:
+    return value[:1].upper() + value[1:] if offset == 0 else value
+
+
 def text_upper(text: Text) -> Text:
-    return text_fmap(str.upper, text)
+    return text_transform(_upper, text)
 
 
 def text_lower(text: Text) -> Text:
-    return text_fmap(str.lower, text)
+    return text_transform(_lower, text)
 
 
 def text_capitalize(text: Text) -> Text:
-    def funcs() -> Iterator[Callable[[str], str]]:
-        # iterate until a non-empty string is found
-        for _ in takewhile(lambda x: not x, text_iter(text)):
-            yield lambda x: x
-        # non-empty string is found! capitalize it
-        yield str.capitalize
-        # convert the rest to lower case
-        yield from repeat(str.lower)
-    return text_fmap_iter(text, funcs())
+    return text_transform(_capitalize, text)
 
 
 def text_capfirst(text: Text) -> Text:
-    def _capfirst(value: str) -> str:
-        assert value  # this is guaranteed by the funcs code below
-        return value[0].upper() + value[1:]
+    return text_transform(_capfirst, text)
+
+
+# styles for which directly nested copies are redundant
+_idempotent_styles = (FontSize, FontStyle, FontVariant, FontWeight)
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+def _join_parts(children: List[Text]) -> List[Text]:
+    """Flatten joins, merge adjacent strings, and drop empty strings."""
+    parts: List[Text] = []
+    strings: List[str] = []  # pending strings, to be merged
+    for child in children:
+        for part in child.children if type(child) is Join else [child]:
+            if isinstance(part, str):
+                strings.append(part)
+                continue
+            if strings:
+                parts.append(''.join(strings))
+                strings.clear()
+            parts.append(part)
+    if strings:
+        parts.append(''.join(strings))
+    return [part for part in parts if part != '']
+
+
+def _normalize_node(text: BaseText, children: List[Text]) -> Text:
+    if type(text) is Join:
+        children = _join_parts(children)
+        if not children:
+            return ''
+        elif len(children) == 1:
+            return children[0]
+    elif isinstance(text, Child):
+        child = children[0]
+        if child == '':
+            return ''
+        if isinstance(text, _idempotent_styles) \
+                and type(child) is type(text) \
+                and child._key()[1:] == text._key()[1:]:
+            return child
+    return _replace_changed(text, children)
+
+
+def text_normalize(text: Text) -> Text:
+    """Canonical form of *text*: nested joins are flattened,
+    adjacent strings are merged, empty strings and empty styled texts
+    are removed, and redundant nested font styles are collapsed.
+    Joins with a single child are replaced by that child,
+    and empty joins are replaced by the empty string.
+    """
+    return text_fold(text, _identity, _normalize_node)
 
-    def funcs() -> Iterator[Callable[[str], str]]:
-        # iterate until a non-empty string is found
-        for _ in takewhile(lambda x: not x, text_iter(text)):
-            yield lambda x: x
-        # non-empty string is found! capitalize first character
-        yield _capfirst
-        # keep the rest as is
-        yield from repeat(lambda x: x)
 
-    return text_fmap_iter(text, funcs())
+def texts_normalize(texts: Iterable[Text]) -> List[Text]:
+    """Canonical form of a sequence of texts, as for :func:`text_normalize`.
+    """
+    text = text_normalize(Join(texts))
+    return list(text.children) if type(text) is Join else (
+        [text] if text != '' else [])
 
 
 _punctuation_chars = tuple(char for char in string.punctuation)
 
 
 def list_join(
-        children: List[T],
+        children: Iterable[T],
         sep: Optional[T] = None,
         sep2: Optional[T] = None,
         last_sep: Optional[T] = None,
         other: Optional[T] = None
         ) -> List[T]:
-    if sep is None or not children:
-        return children
-    elif len(children) == 1:
-        return [children[0]]
-    elif len(children) == 2:
-        return [children[0], sep2 if sep2 is not None else sep, children[1]]
+    """Join *children* with separators. Iterators of children are consumed
+    lazily: if *sep* and *other* are given, only the first three children
+    are taken.
+    """
+    if sep is None:
+        return list(children)
+    items = list(islice(children, 3) if other is not None else children)
+    if len(items) <= 1:
+        return items
+    elif len(items) == 2:
+        return [items[0], sep2 if sep2 is not None else sep, items[1]]
     elif other is None:
-        p1 = [text for child in children[:-2] for text in [child, sep]]
-        p2 = [children[-2], last_sep if last_sep is not None else sep,
-              children[-1]]
+        p1 = [text for child in items[:-2] for text in [child, sep]]
+        p2 = [items[-2], last_sep if last_sep is not None else sep,
+              items[-1]]
         return p1 + p2
     else:
-        return [children[0], other]
+        return [items[0], other]
@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+from collections import deque
+from itertools import islice
+from typing import (
+    Any, Callable, Generator, Iterable, List, Optional, TypeVar, Union
+)
+
+from rite.plugin import find_plugin
+from rite.render import RenderProtocol
+from rite.style.compiler import template_compile
+from rite.style.template import Description
+
+Data = TypeVar('Data')
+
+# template and renderer of the current worker process
+_worker_render: Optional[Callable[[Any], str]] = None
+
+
+def _render_func(template: Description,
+                 renderer: Union[str, RenderProtocol[Iterable[str]]]
+                 ) -> Callable[[Any], str]:
+    node = template_compile(template)
+    render = (find_plugin('rite.render', renderer)()
+              if isinstance(renderer, str) else renderer)
+
+    def func(data: Any) -> str:
+        return ''.join(render(node(data)))
+    return func
+
+
+def _worker_init(template: Description,
+                 renderer: Union[str, RenderProtocol[Iterable[str]]]
+                 ) -> None:
+    global _worker_render
+    _worker_render = _render_func(template, renderer)
+
+
+def _worker_map(records: List[Any]) -> List[str]:
+    assert _worker_render is not None
+    return [_worker_render(data) for data in records]
+
+
+def render_many(template: Description, records: Iterable[Data],
+                renderer: Union[str, RenderProtocol[Iterable[str]]],
+                workers: Optional[int] = None, chunksize: int = 100,
+                ) -> Generator[str, None, None]:
+    """Evaluate *template* on each record and render the result,
+    in parallel over a pool of *workers* processes
+    (by default, one per cpu; with zero, everything runs in this process).
+    Results are yielded in the order of *records*.
+    Records are sent to the workers in chunks of *chunksize*,
+    and are consumed lazily: at most two chunks per worker are
+    in flight at any time, so memory use does not grow with the
+    number of records.
+
+    The *template* is either a node or a description
+    (see :mod:`rite.style.compiler`) which is compiled once per worker.
+    The *renderer* is either a renderer or the name of a renderer plugin,
+    such as ``'html'``.
+    Both are first set up in this process, so errors are raised here.
+    The template, renderer, and records must be picklable
+    if the platform does not fork worker processes.
+    """
+    render = _render_func(template, renderer)
+    if workers == 0:
+        yield from map(render, records)
+        return
+    workers = workers or os.cpu_count() or 1
+    records_iter = iter(records)
+    chunks = iter(lambda: list(islice(records_iter, chunksize)), [])
+    with multiprocessing.Pool(workers, initializer=_worker_init,
+                              initargs=(template, renderer)) as pool:
+        pending = deque(pool.apply_async(_worker_map, (chunk,))
+                        for chunk in islice(chunks, 2 * workers))
+        while pending:
+            results = pending.popleft().get()
+            pending.extend(pool.apply_async(_worker_map, (chunk,))
+                           for chunk in islice(chunks, 1))
+            yield from results
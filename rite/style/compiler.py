@@ -0,0 +1,140 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from rite.richtext import (
+    Text, Join, Semantic, FontSize, FontStyle, FontVariant, FontWeight
+)
+from rite.richtext.utils import (
+    list_join, text_capfirst, text_capitalize, text_lower, text_upper
+)
+from rite.style.template import (
+    Description, JoinNode, MemoizeNode, Node, TemplateNode
+)
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.namespace: Dict[str, Any] = {}
+        self.names: Dict[int, str] = {}  # maps id of constant to its name
+        self.lines: List[str] = []
+
+    def constant(self, value: Any) -> str:
+        if value is None or type(value) in (str, int):
+            return repr(value)
+        name = self.names.get(id(value))
+        if name is None:
+            name = self.names[id(value)] = f'_c{len(self.names)}'
+            self.namespace[name] = value
+        return name
+
+    def assign(self, code: str) -> str:
+        name = f'_v{len(self.lines)}'
+        self.lines.append(f'    {name} = {code}')
+        return name
+
+    def expression(self, description: Description) -> str:
+        """Emit code for *description*, and return the expression
+        that holds its value.
+        """
+        if isinstance(description, TemplateNode):
+            description = description.describe()
+        if not isinstance(description, tuple):
+            return self.assign(f'{self.constant(description)}(data)')
+        name, *args = description
+        return _compilers[name](self, *args)
+
+    def source(self, description: Description, name: str) -> str:
+        result = self.expression(description)
+        return '\n'.join(
+            [f'def {name}(data):', *self.lines, f'    return {result}'])
+
+
+def _str(compiler: _Compiler, value: Text) -> str:
+    return compiler.constant(value)
+
+
+def _join(compiler: _Compiler, children: List[Description],
+          sep: Optional[Text] = None, sep2: Optional[Text] = None,
+          last_sep: Optional[Text] = None, other: Optional[Text] = None,
+          skip_empty: bool = False) -> str:
+    if skip_empty:
+        # the layout depends on which children are empty, so it is done
+        # lazily at run time, by a join of the compiled children
+        node = JoinNode(
+            tuple(template_compile(child) for child in children),
+            sep, sep2, last_sep, other, skip_empty)
+        return compiler.assign(f'{compiler.constant(node)}(data)')
+    # the number of children is fixed, so lay out separators right now
+    # children dropped by the layout are never evaluated
+    indices = list_join(
+        list(range(len(children))),
+        sep=-1 if sep is not None else None,
+        sep2=-2 if sep2 is not None else None,
+        last_sep=-3 if last_sep is not None else None,
+        other=-4 if other is not None else None)
+    separators = {-1: sep, -2: sep2, -3: last_sep, -4: other}
+    codes = [compiler.expression(children[i]) if i >= 0
+             else compiler.constant(separators[i]) for i in indices]
+    return compiler.assign(
+        f"{compiler.constant(Join)}([{', '.join(codes)}])")
+
+
+def _style(cls: type) -> Callable[[_Compiler, Description, Any], str]:
+    def func(compiler: _Compiler, child: Description, style: Any) -> str:
+        code = compiler.expression(child)
+        return compiler.assign(
+            f'{compiler.constant(cls)}({code}, {compiler.constant(style)})')
+    return func
+
+
+def _transform(function: Callable[[Text], Text]
+               ) -> Callable[[_Compiler, Description], str]:
+    def func(compiler: _Compiler, child: Description) -> str:
+        code = compiler.expression(child)
+        return compiler.assign(f'{compiler.constant(function)}({code})')
+    return func
+
+
+def _memoize(compiler: _Compiler, child: Description,
+             maxsize: Optional[int] = 128, key: Any = None) -> str:
+    # the cached child is compiled separately, so it is only run on a miss
+    node = MemoizeNode(template_compile(child), maxsize, key)
+    return compiler.assign(f'{compiler.constant(node)}(data)')
+
+
+_compilers: Dict[str, Callable[..., str]] = {
+    'str_': _str,
+    'const': _str,
+    'join': _join,
+    'semantic': _style(Semantic),
+    'font_size': _style(FontSize),
+    'font_style': _style(FontStyle),
+    'font_variant': _style(FontVariant),
+    'font_weight': _style(FontWeight),
+    'capfirst': _transform(text_capfirst),
+    'capitalize': _transform(text_capitalize),
+    'lower': _transform(text_lower),
+    'upper': _transform(text_upper),
+    'memoize': _memoize,
+}
+
+
+def template_source(description: Description, name: str = 'template'
+                    ) -> str:
+    """Python source code of the compiled template, for inspection.
+    The template is given by its node or by its description.
+    """
+    return _Compiler().source(description, name)
+
+
+def template_compile(description: Description) -> Node[Any]:
+    """Compile the template into one Python function.
+    Separators are laid out at compile time, and the function has no
+    call overhead for the nodes from :mod:`rite.style.template`.
+    Memoized subtemplates are compiled into a new :class:`MemoizeNode`,
+    with its own cache.
+    """
+    compiler = _Compiler()
+    source = compiler.source(description, 'template')
+    namespace = compiler.namespace
+    exec(compile(source, '<template>', 'exec'), namespace)
+    return namespace['template']
@@ -0,0 +1,59 @@
+from typing import Any, List, Tuple
+
+from rite.richtext.utils import list_join
+from rite.style.template import (
+    Description, Node, TemplateNode, template_build
+)
+
+
+def template_optimize(template: Description) -> Node[Any]:
+    """Optimize the template, given by its node or by its description.
+    Subtemplates that do not depend on the data are evaluated once,
+    and replaced by a constant node which returns the same immutable
+    text on every call. The separators of every join are laid out
+    right away, and children that the layout drops are removed.
+    Opaque nodes are assumed to depend on the data.
+    Memoized subtemplates get a new :class:`MemoizeNode`,
+    with its own cache.
+    """
+    return template_build(_optimize(template))
+
+
+def _is_constant(description: Description) -> bool:
+    return isinstance(description, tuple) and description[0] in _constants
+
+
+def _fold(description: Tuple[Any, ...], children: List[Description]
+          ) -> Description:
+    """Evaluate the description if all its children are constant."""
+    if all(_is_constant(child) for child in children):
+        return 'const', template_build(description)(None)
+    return description
+
+
+def _optimize(description: Description) -> Description:
+    if isinstance(description, TemplateNode):
+        description = description.describe()
+    if not isinstance(description, tuple):
+        return description
+    name, *args = description
+    if name in _constants:
+        return description
+    elif name == 'join':
+        children, *separators = args
+        skip_empty = len(separators) > 4 and separators[4]
+        optimized = [_optimize(child) for child in children]
+        if skip_empty:
+            # which children are empty is only known at run time
+            joined = ('join', optimized, *separators)
+            return _fold(joined, optimized)
+        parts: List[Description] = list_join(
+            optimized, *[('const', sep) if sep is not None else None
+                         for sep in separators[:4]])
+        return _fold(('join', parts), parts)
+    else:
+        child = _optimize(args[0])
+        return _fold((name, child, *args[1:]), [child])
+
+
+_constants = {'str_', 'const'}
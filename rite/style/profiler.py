@@ -0,0 +1,113 @@
+import dataclasses
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+from rite.richtext import Text
+from rite.richtext.utils import text_raw
+from rite.style.template import (
+    Node, TemplateNode, template_children, template_map
+)
+
+
+@dataclasses.dataclass
+class NodeStats:
+    """Profile of one template node."""
+    name: str
+    depth: int  #: depth of the first occurrence of the node in the template
+    calls: int = 0
+    total_time: float = 0.0  #: seconds, including children
+    own_time: float = 0.0  #: seconds, excluding children
+    size: int = 0  #: total number of characters of all results
+
+
+def _node_name(node: Node[Any]) -> str:
+    if isinstance(node, TemplateNode):
+        return node.describe()[0]
+    return getattr(node, '__qualname__', type(node).__name__)
+
+
+class _ProfiledNode:
+    def __init__(self, child: Node[Any], stats: NodeStats,
+                 times: List[float]) -> None:
+        self.child = child
+        self.stats = stats
+        self.times = times
+
+    def __call__(self, data: Any) -> Text:
+        times = self.times
+        times.append(0.0)
+        start = perf_counter()
+        try:
+            result = self.child(data)
+        finally:
+            elapsed = perf_counter() - start
+            children_time = times.pop()
+        stats = self.stats
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.own_time += elapsed - children_time
+        stats.size += len(text_raw(result))
+        if times:  # charge the parent, including the profiling overhead
+            times[-1] += perf_counter() - start
+        return result
+
+
+class ProfiledTemplate:
+    """Template that records statistics of every node,
+    see :func:`template_profile`.
+    """
+
+    def __init__(self, template: Node[Any]) -> None:
+        self.template = template
+        self.stats: List[NodeStats] = []  # in template order
+        self._times: List[float] = []  # children time of running nodes
+        stats = self._node_stats(template)
+        self.root = template_map(
+            lambda node, copy: _ProfiledNode(
+                copy, stats[id(node)], self._times), template)
+
+    def _node_stats(self, template: Node[Any]) -> Dict[int, NodeStats]:
+        stats: Dict[int, NodeStats] = {}
+        stack: List[Tuple[Node[Any], int]] = [(template, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if id(node) not in stats:
+                stats[id(node)] = NodeStats(_node_name(node), depth)
+                self.stats.append(stats[id(node)])
+                stack.extend((child, depth + 1) for child
+                             in reversed(template_children(node)))
+        return stats
+
+    def __call__(self, data: Any) -> Text:
+        return self.root(data)
+
+    def reset(self) -> None:
+        """Reset all statistics."""
+        for stats in self.stats:
+            stats.calls = 0
+            stats.total_time = stats.own_time = 0.0
+            stats.size = 0
+
+    def report(self) -> str:
+        """Table of the statistics, with one line per node,
+        indented as in the template. Times are in milliseconds.
+        """
+        lines = [f"{'calls':>8} {'total':>10} {'own':>10} {'size':>10}  node"]
+        for stats in self.stats:
+            lines.append(
+                f"{stats.calls:>8} {stats.total_time * 1000:>10.3f}"
+                f" {stats.own_time * 1000:>10.3f} {stats.size:>10}  "
+                f"{'  ' * stats.depth}{stats.name}")
+        return '\n'.join(lines)
+
+
+def template_profile(template: Node[Any]) -> ProfiledTemplate:
+    """Template that gives the same results as *template*, and that
+    records the number of calls, the time spent with and without
+    children, and the size of the results, of every node.
+    The template itself is left untouched, so there is no overhead
+    when it is used without profiling.
+    A profiled template must not be evaluated from several threads
+    at once, and is only evaluated synchronously.
+    """
+    return ProfiledTemplate(template)
@@ -0,0 +1,112 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from rite.richtext import Text
+from rite.style.template import (
+    ConstNode, Node, StrNode, template_acall, template_children,
+    template_map
+)
+
+# results of the shared nodes for the record being evaluated,
+# as futures when evaluated asynchronously
+_results: "ContextVar[Optional[Dict[_SharedNode, Any]]]" = ContextVar(
+    '_results', default=None)
+
+
+class _SharedNode:
+    """Node which is evaluated at most once per record."""
+
+    def __init__(self, child: Node[Any], template: "SharedTemplate") -> None:
+        self.child = child
+        self.template = template
+
+    def __call__(self, data: Any) -> Text:
+        results = _results.get()
+        if results is None:  # not evaluated through the shared template
+            return self.child(data)
+        try:
+            result = results[self]
+        except KeyError:
+            self.template.evaluated += 1
+            result = results[self] = self.child(data)
+        else:
+            self.template.saved += 1
+        return result
+
+    async def acall(self, data: Any) -> Text:
+        results = _results.get()
+        if results is None:
+            return await template_acall(self.child, data)
+        try:
+            future = results[self]
+        except KeyError:
+            self.template.evaluated += 1
+            future = results[self] = asyncio.ensure_future(
+                template_acall(self.child, data))
+        else:
+            self.template.saved += 1
+        return await future
+
+
+class SharedTemplate:
+    """Template in which every node that occurs more than once
+    is evaluated only once per record, see :func:`template_share`.
+    The *evaluated* and *saved* counters give the number of
+    evaluations of such shared nodes, and the number of evaluations
+    that were saved by reusing their result.
+    """
+
+    def __init__(self, template: Node[Any]) -> None:
+        self.template = template
+        self.evaluated = 0
+        self.saved = 0
+        self.root = _share(template, self)
+
+    def __call__(self, data: Any) -> Text:
+        token = _results.set({})
+        try:
+            return self.root(data)
+        finally:
+            _results.reset(token)
+
+    async def acall(self, data: Any) -> Text:
+        token = _results.set({})
+        try:
+            return await template_acall(self.root, data)
+        finally:
+            _results.reset(token)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.template,)
+
+
+def _share(template: Node[Any], shared: SharedTemplate) -> Node[Any]:
+    # count the references to every node instance
+    counts: Dict[int, int] = {id(template): 1}
+
+    def count(node: Node[Any], copy: Node[Any]) -> Node[Any]:
+        for child in template_children(node):
+            counts[id(child)] = counts.get(id(child), 0) + 1
+        return node
+
+    def wrap(node: Node[Any], copy: Node[Any]) -> Node[Any]:
+        if counts[id(node)] > 1 \
+                and not isinstance(node, (StrNode, ConstNode)):
+            return _SharedNode(copy, shared)
+        return copy
+    template_map(count, template)
+    return template_map(wrap, template)
+
+
+def template_share(template: Node[Any]) -> SharedTemplate:
+    """Template that gives the same results as *template*, in which
+    every node instance that occurs more than once in the template,
+    such as a name used both in a label and in a reference,
+    is evaluated only once per record.
+    Evaluations of different records, also from different threads or
+    tasks, do not share results.
+    Pickling keeps the sharing of opaque nodes only, since template
+    nodes pickle as their description.
+    """
+    return SharedTemplate(template)
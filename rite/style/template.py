@@ -1,16 +1,25 @@
+import asyncio
+import dataclasses
+import inspect
 import sys
-from typing import TypeVar, Optional, List
+from collections import OrderedDict
+from typing import (
+    Any, Callable, ClassVar, Dict, Generic, Hashable, Iterable, Iterator,
+    List, NamedTuple, Optional, Tuple, Type, TypeVar, Union
+)
 if sys.version_info >= (3, 8):
     from typing import Protocol
 else:
     from typing_extensions import Protocol
 
+from rite.render import RenderProtocol, RenderType
 from rite.richtext import (
-    Text, Join, Semantics, FontSizes, FontStyles, FontVariants,
-    Semantic, FontSize, FontStyle, FontVariant, FontWeight
+    BaseText, Event, Text, Join, Semantics, FontSizes, FontStyles,
+    FontVariants, Semantic, FontSize, FontStyle, FontVariant, FontWeight
 )
 from rite.richtext.utils import (
     list_join, text_capfirst, text_lower, text_upper, text_capitalize,
+    text_events, text_is_empty,
 )
 
 Data = TypeVar('Data', contravariant=True)
@@ -22,80 +31,521 @@ class Node(Protocol[Data]):
         pass  # pragma: no cover
 
 
+# A template is described declaratively by nested tuples, whose first item
+# names a node function from this module, and whose other items
+# are the arguments of that function, with child nodes again given by
+# their description. For example:
+#     ('join', [('semantic', name, Semantics.EMPHASIS), ('str_', ': ')])
+# Any other callable is used as an opaque node.
+Description = Union[Tuple[Any, ...], Node[Any]]
+
+
+class TemplateNode(Generic[Data]):
+    """Base class for the nodes of this module.
+    Nodes pickle as their description, so the pickled form is compact
+    and fast to load. Apart from :class:`MemoizeNode`, which holds a
+    cache and compares by identity, nodes are immutable and compare
+    by value.
+    Opaque child nodes must be picklable themselves,
+    for instance by being module level functions.
+    """
+
+    def __call__(self, data: Data) -> Text:
+        raise NotImplementedError  # pragma: no cover
+
+    async def acall(self, data: Data) -> Text:
+        """Evaluate the node asynchronously, see :func:`template_acall`."""
+        return self(data)
+
+    def events(self, data: Data) -> Iterator[Event]:
+        """Events of the result, see :func:`template_events`."""
+        return text_events(self(data))
+
+    def describe(self) -> Tuple[Any, ...]:
+        """The description of this node."""
+        raise NotImplementedError  # pragma: no cover
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return template_build, (self.describe(),)
+
+
+@dataclasses.dataclass(frozen=True)
+class StrNode(TemplateNode[Data]):
+    value: str
+
+    def __call__(self, data: Data) -> Text:
+        return self.value
+
+    def events(self, data: Data) -> Iterator[Event]:
+        yield self.value
+
+    def describe(self) -> Tuple[Any, ...]:
+        return 'str_', self.value
+
+
+@dataclasses.dataclass(frozen=True)
+class ConstNode(TemplateNode[Data]):
+    text: Text
+
+    def __call__(self, data: Data) -> Text:
+        return self.text
+
+    def describe(self) -> Tuple[Any, ...]:
+        return 'const', self.text
+
+
+_join_style = Join([])  # for opening events
+
+
+def _is_empty(text: Text) -> bool:
+    return not text if isinstance(text, str) else text_is_empty(text)
+
+
+@dataclasses.dataclass(frozen=True)
+class JoinNode(TemplateNode[Data]):
+    """Node which joins its children with separators.
+    Only the children that end up in the result are evaluated.
+    If *skip_empty* is set, empty children are dropped before the
+    separators are laid out, and children are evaluated one by one
+    until the layout is known.
+    When evaluated asynchronously, the children are evaluated
+    concurrently, and with *skip_empty* all of them are evaluated.
+    """
+    children: Tuple[Node[Data], ...]
+    sep: Optional[Text] = None
+    sep2: Optional[Text] = None
+    last_sep: Optional[Text] = None
+    other: Optional[Text] = None
+    skip_empty: bool = False
+    # children and separators as laid out, if this does not depend on data
+    _parts: Tuple[Node[Data], ...] = dataclasses.field(
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        parts: Tuple[Node[Data], ...] = ()
+        if not self.skip_empty:
+            separators: List[Optional[Node[Data]]] = [
+                ConstNode(sep) if sep is not None else None
+                for sep in [self.sep, self.sep2, self.last_sep, self.other]]
+            parts = tuple(list_join(self.children, *separators))
+        object.__setattr__(self, '_parts', parts)
+
+    def __call__(self, data: Data) -> Text:
+        if not self.skip_empty:
+            return Join([part(data) for part in self._parts])
+        texts = (child(data) for child in self.children)
+        return Join(list_join(
+            (text for text in texts if not _is_empty(text)),
+            sep=self.sep, sep2=self.sep2, last_sep=self.last_sep,
+            other=self.other))
+
+    def events(self, data: Data) -> Iterator[Event]:
+        if self.skip_empty:
+            yield from text_events(self(data))
+            return
+        yield _join_style
+        for part in self._parts:
+            yield from template_events(part, data)
+        yield None
+
+    async def acall(self, data: Data) -> Text:
+        if not self.skip_empty:
+            return Join(await asyncio.gather(
+                *(template_acall(part, data) for part in self._parts)))
+        texts = await asyncio.gather(
+            *(template_acall(child, data) for child in self.children))
+        return Join(list_join(
+            (text for text in texts if not _is_empty(text)),
+            sep=self.sep, sep2=self.sep2, last_sep=self.last_sep,
+            other=self.other))
+
+    def describe(self) -> Tuple[Any, ...]:
+        return ('join', [template_describe(child) for child in self.children],
+                self.sep, self.sep2, self.last_sep, self.other,
+                self.skip_empty)
+
+
+@dataclasses.dataclass(frozen=True)
+class _StyleNode(TemplateNode[Data]):
+    child: Node[Data]
+    style: Any
+    name: ClassVar[str]
+    text_type: ClassVar[Type[Any]]  # rich text class, with style argument
+    # styled empty text, for opening events
+    _style: BaseText = dataclasses.field(
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_style', self.text_type('', self.style))
+
+    def __call__(self, data: Data) -> Text:
+        return self.text_type(self.child(data), self.style)
+
+    def events(self, data: Data) -> Iterator[Event]:
+        yield self._style
+        yield from template_events(self.child, data)
+        yield None
+
+    async def acall(self, data: Data) -> Text:
+        return self.text_type(
+            await template_acall(self.child, data), self.style)
+
+    def describe(self) -> Tuple[Any, ...]:
+        return self.name, template_describe(self.child), self.style
+
+
+@dataclasses.dataclass(frozen=True)
+class SemanticNode(_StyleNode[Data]):
+    style: Semantics
+    name = 'semantic'
+    text_type = Semantic
+
+
+@dataclasses.dataclass(frozen=True)
+class FontSizeNode(_StyleNode[Data]):
+    style: FontSizes
+    name = 'font_size'
+    text_type = FontSize
+
+
+@dataclasses.dataclass(frozen=True)
+class FontStyleNode(_StyleNode[Data]):
+    style: FontStyles
+    name = 'font_style'
+    text_type = FontStyle
+
+
+@dataclasses.dataclass(frozen=True)
+class FontVariantNode(_StyleNode[Data]):
+    style: FontVariants
+    name = 'font_variant'
+    text_type = FontVariant
+
+
+@dataclasses.dataclass(frozen=True)
+class FontWeightNode(_StyleNode[Data]):
+    style: int
+    name = 'font_weight'
+    text_type = FontWeight
+
+
+@dataclasses.dataclass(frozen=True)
+class _TransformNode(TemplateNode[Data]):
+    child: Node[Data]
+    name: ClassVar[str]
+
+    @staticmethod
+    def function(text: Text) -> Text:
+        raise NotImplementedError  # pragma: no cover
+
+    def __call__(self, data: Data) -> Text:
+        return self.function(self.child(data))
+
+    async def acall(self, data: Data) -> Text:
+        return self.function(await template_acall(self.child, data))
+
+    def describe(self) -> Tuple[Any, ...]:
+        return self.name, template_describe(self.child)
+
+
+@dataclasses.dataclass(frozen=True)
+class CapfirstNode(_TransformNode[Data]):
+    name = 'capfirst'
+    function = staticmethod(text_capfirst)
+
+
+@dataclasses.dataclass(frozen=True)
+class CapitalizeNode(_TransformNode[Data]):
+    name = 'capitalize'
+    function = staticmethod(text_capitalize)
+
+
+@dataclasses.dataclass(frozen=True)
+class LowerNode(_TransformNode[Data]):
+    name = 'lower'
+    function = staticmethod(text_lower)
+
+
+@dataclasses.dataclass(frozen=True)
+class UpperNode(_TransformNode[Data]):
+    name = 'upper'
+    function = staticmethod(text_upper)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class MemoizeNode(TemplateNode[Data]):
+    """Node which caches the results of its child, keyed by the data
+    or by *key* applied to the data, and evicts the least recently used
+    result once there are more than *maxsize* (no limit if ``None``).
+    Rich text is immutable, so results are shared safely.
+    Without *key*, the data must be hashable: for records such as
+    dictionaries or plain dataclasses, pass a *key* function.
+    The cache is not pickled. Optimizing or compiling a template
+    creates new memoize nodes, with their own cache and statistics.
+    """
+
+    def __init__(self, child: Node[Data], maxsize: Optional[int] = 128,
+                 key: Optional[Callable[[Data], Hashable]] = None) -> None:
+        self.child = child
+        self.maxsize = maxsize
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Hashable, Text]" = OrderedDict()
+
+    def _lookup(self, data: Data) -> Tuple[Hashable, Optional[Text]]:
+        """The key of the data, and the cached result, if any."""
+        key = data if self.key is None else self.key(data)
+        try:
+            result = self._cache[key]
+        except TypeError:
+            raise TypeError(
+                f"cannot memoize on unhashable {type(key).__name__} data,"
+                f" pass a key function") from None
+        except KeyError:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return key, result
+
+    def _store(self, key: Hashable, result: Text) -> Text:
+        self._cache[key] = result
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return result
+
+    def __call__(self, data: Data) -> Text:
+        key, result = self._lookup(data)
+        if result is None:
+            return self._store(key, self.child(data))
+        return result
+
+    async def acall(self, data: Data) -> Text:
+        key, result = self._lookup(data)
+        if result is None:
+            return self._store(key, await template_acall(self.child, data))
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss statistics, as for :func:`functools.lru_cache`."""
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Clear the cache and its statistics."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def describe(self) -> Tuple[Any, ...]:
+        return ('memoize', template_describe(self.child),
+                self.maxsize, self.key)
+
+
 def str_(value: str) -> Node[Data]:
     """A plain string node."""
-    def fmt(data: Data) -> Text:
-        return value
-    return fmt
+    return StrNode(value)
+
+
+def const(text: Text) -> Node[Data]:
+    """A node which always returns the same rich *text*."""
+    return ConstNode(text)
 
 
 def join(children: List[Node[Data]],
          sep: Optional[Text] = None,
          sep2: Optional[Text] = None,
          last_sep: Optional[Text] = None,
-         other: Optional[Text] = None
+         other: Optional[Text] = None,
+         skip_empty: bool = False
          ) -> Node[Data]:
-    """A node which joins its *children* with the given separators."""
-    def fmt(data: Data) -> Text:
-        return Join(list_join(
-            [child(data) for child in children],
-            sep=sep, sep2=sep2, last_sep=last_sep, other=other))
-    return fmt
+    """A node which joins its *children* with the given separators,
+    see :class:`JoinNode`.
+    """
+    return JoinNode(tuple(children), sep, sep2, last_sep, other, skip_empty)
 
 
 def semantic(child: Node[Data], style: Semantics) -> Node[Data]:
-    def fmt(data: Data) -> Text:
-        return Semantic(child(data), style)
-    return fmt
+    return SemanticNode(child, style)
 
 
 def font_size(child: Node[Data], style: FontSizes) -> Node[Data]:
-    def fmt(data: Data) -> Text:
-        return FontSize(child(data), style)
-    return fmt
+    return FontSizeNode(child, style)
 
 
 def font_style(child: Node[Data], style: FontStyles) -> Node[Data]:
-    def fmt(data: Data) -> Text:
-        return FontStyle(child(data), style)
-    return fmt
+    return FontStyleNode(child, style)
 
 
 def font_variant(child: Node[Data], style: FontVariants) -> Node[Data]:
-    def fmt(data: Data) -> Text:
-        return FontVariant(child(data), style)
-    return fmt
+    return FontVariantNode(child, style)
 
 
 def font_weight(child: Node[Data], style: int) -> Node[Data]:
-    def fmt(data: Data) -> Text:
-        return FontWeight(child(data), style)
-    return fmt
+    return FontWeightNode(child, style)
 
 
 def capfirst(child: Node[Data]) -> Node[Data]:
     """A node which capitalizes the first letter of its child."""
-    def fmt(data: Data) -> Text:
-        return text_capfirst(child(data))
-    return fmt
+    return CapfirstNode(child)
 
 
 def capitalize(child: Node[Data]) -> Node[Data]:
     """A node which capitalizes all words of its child."""
-    def fmt(data: Data) -> Text:
-        return text_capitalize(child(data))
-    return fmt
+    return CapitalizeNode(child)
 
 
 def lower(child: Node[Data]) -> Node[Data]:
     """A node which converts its child to lower case."""
-    def fmt(data: Data) -> Text:
-        return text_lower(child(data))
-    return fmt
+    return LowerNode(child)
 
 
 def upper(child: Node[Data]) -> Node[Data]:
     """A node which converts its child to upper case."""
-    def fmt(data: Data) -> Text:
-        return text_upper(child(data))
-    return fmt
+    return UpperNode(child)
+
+
+def memoize(child: Node[Data], maxsize: Optional[int] = 128,
+            key: Optional[Callable[[Data], Hashable]] = None
+            ) -> MemoizeNode[Data]:
+    """A node which caches the results of its child,
+    see :class:`MemoizeNode`.
+    """
+    return MemoizeNode(child, maxsize, key)
+
+
+_builders: Dict[str, Callable[..., Node[Any]]] = {
+    'semantic': semantic,
+    'font_size': font_size,
+    'font_style': font_style,
+    'font_variant': font_variant,
+    'font_weight': font_weight,
+    'capfirst': capfirst,
+    'capitalize': capitalize,
+    'lower': lower,
+    'upper': upper,
+    'memoize': memoize,
+}
+
+
+async def template_acall(node: Node[Data], data: Data) -> Text:
+    """Evaluate *node* asynchronously. Opaque nodes may return
+    awaitables, for instance if they are coroutine functions,
+    and children of joins are evaluated concurrently.
+    The result is the same as for a synchronous evaluation.
+    Compiled templates are opaque, so their leaves cannot be awaited.
+    """
+    acall = getattr(node, 'acall', None)
+    if acall is not None:
+        return await acall(data)
+    result = node(data)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def template_events(node: Node[Data], data: Data) -> Iterator[Event]:
+    """Evaluate *node* into a flat stream of events, the same as
+    ``text_events(node(data))``, but without building the rich text
+    for joins and styles. Other nodes are evaluated as usual.
+    """
+    events = getattr(node, 'events', None)
+    if events is not None:
+        return events(data)
+    return text_events(node(data))
+
+
+def template_render(node: Node[Data], data: Data,
+                    renderer: RenderProtocol[RenderType]) -> RenderType:
+    """Evaluate *node* and render the result with *renderer*,
+    streaming the events of the template into the renderer
+    if it supports this. The result is the same as
+    ``renderer(node(data))``.
+    """
+    render_events = getattr(renderer, 'render_events', None)
+    if render_events is not None:
+        return render_events(template_events(node, data))
+    return renderer(node(data))
+
+
+def template_build(description: Description) -> Node[Any]:
+    """Build the template from its description."""
+    if not isinstance(description, tuple):
+        return description
+    name, *args = description
+    if name == 'join':
+        return join([template_build(child) for child in args[0]], *args[1:])
+    elif name == 'str_':
+        return str_(*args)
+    elif name == 'const':
+        return const(*args)
+    else:
+        return _builders[name](template_build(args[0]), *args[1:])
+
+
+def template_describe(node: Node[Any]) -> Description:
+    """The description of the template, which is plain data
+    apart from opaque nodes.
+    """
+    return node.describe() if isinstance(node, TemplateNode) else node
+
+
+def template_children(node: Node[Any]) -> Tuple[Node[Any], ...]:
+    """The child nodes of *node*; opaque nodes have none."""
+    if isinstance(node, JoinNode):
+        return node.children
+    elif isinstance(node, (_StyleNode, _TransformNode, MemoizeNode)):
+        return node.child,
+    else:
+        return ()
+
+
+def template_replace(node: Node[Any], children: Iterable[Node[Any]]
+                     ) -> Node[Any]:
+    """Copy of *node* with the given child nodes.
+    A memoize node is copied with an empty cache.
+    """
+    if isinstance(node, JoinNode):
+        return dataclasses.replace(node, children=tuple(children))
+    elif isinstance(node, (_StyleNode, _TransformNode)):
+        child, = children
+        return dataclasses.replace(node, child=child)
+    elif isinstance(node, MemoizeNode):
+        child, = children
+        return MemoizeNode(child, node.maxsize, node.key)
+    else:
+        return node
+
+
+def template_map(func: Callable[[Node[Any], Node[Any]], Node[Any]],
+                 template: Node[Any]) -> Node[Any]:
+    """Rebuild *template* bottom up. Every node instance is visited once,
+    after its children, and is replaced by ``func(node, copy)``, where
+    *copy* is *node* with its children replaced by their results
+    (or *node* itself if none changed). Shared nodes stay shared.
+    """
+    results: Dict[int, Node[Any]] = {}
+    stack: List[Tuple[Node[Any], Iterator[Node[Any]]]] = [
+        (template, iter(template_children(template)))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if id(child) not in results:
+                stack.append((child, iter(template_children(child))))
+                break
+        else:
+            stack.pop()
+            old_children = template_children(node)
+            new_children = [results[id(child)] for child in old_children]
+            copy = node if all(
+                new is old for new, old in zip(new_children, old_children)
+            ) else template_replace(node, new_children)
+            results[id(node)] = func(node, copy)
+    return results[id(template)]
@@ -0,0 +1,55 @@
+from typing import List
+
+import pytest
+
+from common import _em, _b, _i
+
+from rite.parse.html import HtmlTextParser, ParseHtmlChunks
+from rite.richtext import Text, Join, Semantic, Semantics, FontWeight
+
+
+@pytest.mark.parametrize(
+    "html,texts", [
+        ('<p>a<p>b<div>c</div>',
+         [Semantic('a', Semantics.PARAGRAPH),
+          Semantic('b', Semantics.PARAGRAPH), 'c']),
+        ('a<br>b<br/>c', ['a', 'b', 'c']),
+        ('a&nbsp;b&amp;c &lt;&#233;', ['a\xa0b&c <é']),
+        ('</em>x<EM>y</Em>z', ['x', _em('y'), 'z']),
+        ('<em>a<b>b', [_em(Join(['a', _b('b')]))]),
+        ('<em>a<b>b</em>c', [_em(Join(['a', _b('b')])), 'c']),
+        ('<i style="font-weight:700">x</i>',
+         [FontWeight(_i('x'), 700)]),
+        ('<p>a<img src="x.png">b</p>',
+         [Semantic(Join(['a', 'b']), Semantics.PARAGRAPH)]),
+    ])
+def test_parse_html_chunks(html: str, texts: List[Text]) -> None:
+    assert list(ParseHtmlChunks()(html)) == texts
+    assert list(ParseHtmlChunks()(iter(html))) == texts
+
+
+def test_parse_html_chunks_normalize() -> None:
+    html = ['a<span>b<em>', '</em></span><b><b>c</b></b>']
+    assert list(ParseHtmlChunks(normalize=True)(html)) == ['ab', _b('c')]
+
+
+def test_html_text_parser_incremental() -> None:
+    parser = HtmlTextParser()
+    parser.feed('a<em>b')
+    assert parser.read_texts() == ['a']
+    parser.feed('c</em>d')
+    assert parser.read_texts() == [_em('bc')]
+    parser.feed('e<b>f</b>')
+    assert parser.read_texts() == ['de', _b('f')]
+    parser.feed('<p>g')
+    assert parser.read_texts() == []
+    parser.close()
+    assert parser.read_texts() == [Semantic('g', Semantics.PARAGRAPH)]
+
+
+def test_html_text_parser_deep() -> None:
+    depth = 10000
+    text: Text = 'x'
+    for _ in range(depth):
+        text = _em(text)
+    assert list(ParseHtmlChunks()('<em>' * depth + 'x')) == [text]
@@ -0,0 +1,155 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from common import _em, _b
+
+from rite.parse.cache import ParseCache
+from rite.parse.latex import ParseLatex, shared_parse_latex
+from rite.richtext import Text, Join, FontSize, FontSizes
+from rite.style.template import CacheInfo
+
+
+def test_parse_latex_cache() -> None:
+    cache: ParseCache[str] = ParseCache(maxsize=2)
+    parse_latex = ParseLatex(cache=cache)
+    assert list(parse_latex(r'\emph{a}')) == [_em('a')]
+    assert list(parse_latex(r'\emph{a}')) == [_em('a')]
+    assert cache.cache_info() == CacheInfo(1, 1, 2, 1)
+    assert cache.hit_rate() == 0.5
+    assert list(parse_latex(r'\textbf{b}')) == [_b('b')]
+    assert list(parse_latex(r'\emph{a}')) == [_em('a')]
+    # evicts \textbf{b}, the least recently used source
+    assert list(parse_latex('c')) == ['c']
+    assert cache.cache_info() == CacheInfo(2, 3, 2, 2)
+    assert list(parse_latex(r'\textbf{b}')) == [_b('b')]
+    assert cache.cache_info() == CacheInfo(2, 4, 2, 2)
+    cache.cache_clear()
+    assert cache.cache_info() == CacheInfo(0, 0, 2, 0)
+    assert cache.hit_rate() == 0.0
+
+
+def test_parse_latex_cache_shared() -> None:
+    cache: ParseCache[str] = ParseCache(maxsize=None)
+    parsers = [ParseLatex(cache=cache), ParseLatex(cache=cache)]
+    sources = [rf'\emph{{{i % 10}}}' for i in range(200)]
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(
+            lambda i: list(parsers[i % 2](sources[i])), range(200)))
+    assert results == [[_em(str(i % 10))] for i in range(200)]
+    info = cache.cache_info()
+    assert info.currsize == 10
+    assert info.hits + info.misses == 200
+    assert info.misses >= 10
+
+
+@pytest.mark.parametrize(
+    "latex,fast", [
+        ('', True),
+        ('a b\n\nc  d', True),
+        (r'\emph{a} and \textbf{b \textit{c}}', True),
+        (r'\emph  {a}', True),
+        (r'\emph x', False),
+        (r'\small  x', True),
+        ('\\small\n  x', True),
+        ('\\small\n\n x', True),
+        (r'{\small} \large{}x', True),
+        (r'\textbf{a \small b} c', True),
+        (r'a {b \LARGE c {d} e} f', True),
+        ('a~b--c---d ``e\'\' don\'t !`f?', True),
+        (r'\%\&\{\}\#\_\$ \ x\,y', True),
+        (r"\'el\`eve \'{e} \c c\c{c} \v{s} na\"ive", True),
+        (r'\i\ss\o \LaTeX \unknownmacro{hi}', True),
+        (r'\textup{y} \textsc{z}', True),
+        (r'\textsf{abc}', False),
+        (r'\section{x}', False),
+        (r"\' e \'\i \\ x", False),
+        (r'\ensuremath{x}', False),
+        (r'$x^2$ % comment', False),
+        (r'\(x\) \[y\]', False),
+        ('a}b', False),
+        ('{a', False),
+        (r'\emph{a', False),
+        ('a\\', False),
+    ])
+def test_parse_latex_fast(latex: str, fast: bool) -> None:
+    parse_latex = ParseLatex()
+    assert (parse_latex._fast_parse is not None
+            and parse_latex._fast_parse(latex) is not None) == fast
+    assert list(parse_latex(latex)) == list(ParseLatex(fast=False)(latex))
+
+
+def _parse_or_error(parse: ParseLatex, latex: str) -> Any:
+    try:
+        return list(parse(latex))
+    except Exception as exc:
+        return type(exc)
+
+
+def test_parse_latex_fast_random() -> None:
+    pieces = [
+        'a', 'b c', ' ', '\n', '\n\n', '{', '}', '~', '-', '--', '`', "'",
+        '!', 'é', r'\emph', r'\textbf', r'\small', r'\Large ', r"\'", 'e',
+        r'\c', r'\%', r'\ ', r'\ss', r'\unknown', r'\textsf', r'\section',
+        r'\textup', '$', '%', r'\\', r'\ensuremath']
+    parse_fast = ParseLatex()
+    parse_full = ParseLatex(fast=False)
+    rnd = random.Random(0)
+    for _ in range(1000):
+        latex = ''.join(rnd.choice(pieces) for _ in range(rnd.randint(1, 9)))
+        assert _parse_or_error(parse_fast, latex) \
+            == _parse_or_error(parse_full, latex), latex
+
+
+def test_parse_latex_fast_flags() -> None:
+    assert ParseLatex()._fast_parse is not None
+    assert ParseLatex(fast=False)._fast_parse is None
+    assert ParseLatex(walker_flags={'tolerant_parsing': False}) \
+        ._fast_parse is None
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_parse_latex_many_switches(fast: bool) -> None:
+    size = 5000
+    latex = ' '.join(r'\small a \large b' for _ in range(size))
+    text: Text = FontSize('b', FontSizes.LARGE)
+    for i in range(size - 1):
+        text = FontSize(
+            Join(['b ', FontSize(Join(['a ', text]), FontSizes.SMALL)]),
+            FontSizes.LARGE)
+    text = FontSize(Join(['a ', text]), FontSizes.SMALL)
+    assert list(ParseLatex(fast=fast)(latex)) == [text]
+
+
+def test_parse_latex_deep() -> None:
+    depth = 10000
+    latex = r'\emph{{' * depth + 'x' + '}}' * depth
+    text: Text = 'x'
+    for _ in range(depth):
+        text = _em(text)
+    assert list(ParseLatex()(latex)) == [text]
+
+
+def test_parse_latex_default_contexts() -> None:
+    parse1, parse2 = ParseLatex(), ParseLatex()
+    assert parse1.walker_context is parse2.walker_context
+    assert parse1.nodes_to_text_context is parse2.nodes_to_text_context
+
+
+def test_shared_parse_latex() -> None:
+    with ThreadPoolExecutor(4) as executor:
+        parsers = list(executor.map(
+            lambda _: shared_parse_latex(), range(20)))
+    assert all(parse is parsers[0] for parse in parsers)
+    assert shared_parse_latex(normalize=True) is not parsers[0]
+    assert shared_parse_latex(normalize=True).normalize
+    assert shared_parse_latex(fast=False)._fast_parse is None
+    fast_parse = parsers[0]._fast_parse
+    assert fast_parse is not None
+    misses = fast_parse.tokens.cache_info().misses
+    assert misses > 0
+    assert list(parsers[0](r"\'el\`eve \& \c{c}")) \
+        == ['é', 'l', 'è', 've ', '&', ' ', 'ç']
+    assert fast_parse.tokens.cache_info().misses == misses
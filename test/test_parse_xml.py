@@ -0,0 +1,129 @@
+import io
+import itertools
+import tracemalloc
+from typing import Any, Iterator, Optional
+from xml.etree.ElementTree import Element, SubElement
+
+import pytest
+
+from common import _em, _b, _i
+
+from rite.parse.xml import (
+    ParseXml, ParseXmlRecords, ElementStyle, element_style,
+    element_font_size, element_font_style, element_font_variant,
+    element_font_weight, _resolve_style,
+)
+from rite.richtext import Join, Text, FontSizes, FontStyles, FontVariants
+
+
+def test_parse_xml_records() -> None:
+    xml = (
+        b'<records><head>skip</head>'
+        b'<record>a<em>b</em>c</record>\n'
+        b'<record><b>x</b></record>tail\n'
+        b'<group><record><i>y<record>z</record></i></record></group>'
+        b'</records>')
+    assert list(ParseXmlRecords('record')(io.BytesIO(xml))) == [
+        Join(['a', _em('b'), 'c']), _b('x'), _i(Join(['y', 'z']))]
+
+
+def test_parse_xml_records_normalize() -> None:
+    xml = b'<r><x>a<b><b>b</b></b></x></r>'
+    assert list(ParseXmlRecords('x')(io.BytesIO(xml))) == [
+        Join(['a', _b(_b('b'))])]
+    assert list(ParseXmlRecords('x', normalize=True)(io.BytesIO(xml))) == [
+        Join(['a', _b('b')])]
+
+
+def test_parse_xml_deep() -> None:
+    depth = 10000
+    root = element = Element('em')
+    for _ in range(depth - 1):
+        element = SubElement(element, 'em')
+    element.text = 'x'
+    root.tail = 'y'
+    text: Text = 'x'
+    for _ in range(depth):
+        text = _em(text)
+    assert list(ParseXml()(root)) == [text, 'y']
+
+
+class _RecordsStream(io.RawIOBase):
+    """Binary stream of an XML document with many records,
+    generated on the fly.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.chunks: Iterator[bytes] = itertools.chain(
+            [b'<records>'],
+            (b'<record>record <em>%d</em></record>' % i
+             for i in range(size)),
+            [b'</records>'])
+        self.buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while len(self.buffer) < len(buffer):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+
+def test_parse_xml_records_memory() -> None:
+    size = 20000
+    tracemalloc.start()
+    try:
+        count = 0
+        for text in ParseXmlRecords('record')(
+                io.BufferedReader(_RecordsStream(size))):
+            assert text == Join(['record ', _em(str(count))])
+            count += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == size
+    # parsing the full tree takes over ten megabytes
+    assert peak < 1_000_000
+
+
+@pytest.mark.parametrize(
+    "tag,style,element_style_", [
+        ('span', None, ElementStyle(None, None, None, None)),
+        ('i', None, ElementStyle(None, FontStyles.ITALIC, None, None)),
+        ('b', None, ElementStyle(None, None, None, 700)),
+        ('i', 'font-style:normal',
+         ElementStyle(None, FontStyles.NORMAL, None, None)),
+        ('i', 'font-style:bad', ElementStyle(None, None, None, None)),
+        ('b', 'font-weight:400', ElementStyle(None, None, None, 400)),
+        ('span', 'font-size:small;font-variant:small-caps;'
+                 'font-style:oblique;font-weight:300',
+         ElementStyle(FontSizes.SMALL, FontStyles.OBLIQUE,
+                      FontVariants.SMALL_CAPS, 300)),
+    ])
+def test_element_style(tag: str, style: Optional[str],
+                       element_style_: ElementStyle) -> None:
+    element = Element(tag, {} if style is None else {'style': style})
+    assert element_style(element) == element_style_
+    assert element_font_size(element) == element_style_.font_size
+    assert element_font_style(element) == element_style_.font_style
+    assert element_font_variant(element) == element_style_.font_variant
+    assert element_font_weight(element) == element_style_.font_weight
+
+
+def test_element_style_cache() -> None:
+    _resolve_style.cache_clear()
+    root = Element('span')
+    for i in range(100):
+        SubElement(root, 'span', {'style': 'font-weight:700'}).text = str(i)
+    texts = list(ParseXml()(root))
+    assert texts == [_b(str(i)) for i in range(100)]
+    info = _resolve_style.cache_info()
+    assert info.misses == 2
+    assert info.hits == 99
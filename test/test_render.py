@@ -5,7 +5,7 @@ from xml.etree.ElementTree import Element
 import pytest
 
 from rite.parse import ParseProtocol
-from rite.parse.html import ParseHtml
+from rite.parse.html import ParseHtml, ParseHtmlChunks
 from rite.parse.latex import ParseLatex
 from rite.parse.xml import ParseXml
 from rite.render import RenderProtocol
@@ -303,6 +303,7 @@ def test_render_parse(
     assert ''.join(map(str, render_latex(Join(texts)))) == latex
     assert_xml_etree_equal(render_xml(Join(texts)), xml_etree)
     assert list(parse_html(html)) == texts
+    assert list(ParseHtmlChunks()(html)) == texts
     assert list(parse_latex(latex)) == (
            latex_parsed if latex_parsed is not None else texts)
 
@@ -364,3 +365,28 @@ def test_render_latex_new_text() -> None:
 def test_render_latex(latex: str, texts: List[Text]) -> None:
     parse_latex = ParseLatex()
     assert list(parse_latex(latex)) == texts
+
+
+def test_render_deep() -> None:
+    depth = 10000
+    text: Text = 'x'
+    for _ in range(depth):
+        text = _em(Join(['<', text]))
+    assert ''.join(RenderHtml()(text)) == \
+        '<em>&lt;' * depth + 'x' + '</em>' * depth
+    assert ''.join(RenderLatex()(text)) == \
+        r'\emph{\ensuremath{<}' * depth + 'x' + '}' * depth
+    assert ''.join(RenderMarkdown()(text)) == '*<' * depth + 'x' + '*' * depth
+    assert ''.join(RenderRst()(text)) == '*<' * depth + 'x' + '*' * depth
+    assert ''.join(RenderPlaintext()(text)) == '<' * depth + 'x'
+    head, elements = RenderXml()(text)
+    assert head is None
+    assert len(list(elements)) == 1
+
+
+def test_parse_normalize() -> None:
+    latex = r"\'el\`eve {\emph{}} \textbf{\textbf{x}}"
+    assert list(ParseLatex(normalize=True)(latex)) == ['élève  ', _b('x')]
+    html = 'a<span>b<em></em></span><b><b>c</b></b>'
+    assert list(ParseHtml(normalize=True)(html)) == ['ab', _b('c')]
+    assert list(ParseHtml()(html)) == ['a', 'b', _em(''), _b(_b('c'))]
@@ -1,6 +1,15 @@
+import copy
+import dataclasses
+import pickle
 from itertools import repeat
 
-from rite.richtext import Join
+import pytest
+
+from rite.richtext import (
+    Text, Join, FontSize, FontSizes, FontStyle,
+    FontStyles, FontVariant, FontVariants, FontWeight
+)
+from rite.richtext.tape import tape_decode, tape_encode
 from common import _em, _st
 from rite.richtext.utils import text_fmap_iter
 
@@ -35,3 +44,66 @@ def test_tag_combined() -> None:
     s2 = 'HELLO'
     assert text_fmap_iter(_em(s1), repeat(str.upper)) == _em(s2)
     assert text_fmap_iter(_em(_st(s1)), repeat(str.upper)) == _em(_st(s2))
+
+
+def test_hash_eq() -> None:
+    x1 = Join(['hello ', _st('brave'), Join([' world'])])
+    x2 = Join(['hello ', _st('brave'), Join([' world'])])
+    assert x1 is not x2
+    assert x1 == x2
+    assert hash(x1) == hash(x2)
+    assert x1 != Join(['hello ', _em('brave'), Join([' world'])])
+    assert _em('x') != _st('x')
+    assert _em('x') != 'x'
+    assert Join(['x']) != _em('x')
+    assert len({x1, x2, _em('x'), _em('x')}) == 2
+
+
+def test_frozen() -> None:
+    x = _em('hello')
+    assert not hasattr(x, '__dict__')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        x.child = 'bye'  # type: ignore
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del x.child  # type: ignore
+
+
+@pytest.mark.parametrize("text", [
+    Join(['hello ', _st('brave'), Join([' world'])]),
+    _em(FontWeight(FontSize(
+        FontStyle(FontVariant('x', FontVariants.SMALL_CAPS),
+                  FontStyles.ITALIC), FontSizes.SMALL), 700)),
+])
+def test_pickle_copy(text: Text) -> None:
+    assert pickle.loads(pickle.dumps(text)) == text
+    assert copy.deepcopy(text) == text
+
+
+def test_repr() -> None:
+    assert repr(Join(['x', FontWeight('y', 700)])) \
+        == "Join(('x', FontWeight('y', 700)))"
+    assert repr(Join(['x'])) == "Join(('x',))"
+    assert repr(Join([])) == "Join(())"
+
+
+def _deep_text(depth: int, leaf: str) -> Text:
+    text: Text = leaf
+    for i in range(depth):
+        text = Join([str(i % 10), FontWeight(text, 700)])
+    return text
+
+
+def test_deep_hash_eq_repr() -> None:
+    depth = 10000
+    text1 = _deep_text(depth, 'x')
+    text2 = _deep_text(depth, 'x')
+    text3 = _deep_text(depth, 'y')
+    assert text1 is not text2
+    assert hash(text1) == hash(text2)
+    assert text1 == text2
+    assert text1 != text3
+    assert tape_decode(tape_encode([text1])) == text1
+    assert repr(text1).endswith(
+        "FontWeight('x', 700)))" + ", 700)))" * (depth - 1))
+    assert repr(_deep_text(2, 'x')) \
+        == "Join(('1', FontWeight(Join(('0', FontWeight('x', 700))), 700)))"
@@ -0,0 +1,91 @@
+from typing import Any, List, Tuple
+
+import pytest
+
+from rite.richtext import BaseText, Text, Join, FontWeight, Semantic, Semantics
+from rite.richtext.diff import (
+    text_diff, text_patch, Edit, Insert, Delete, Replace, Restyle
+)
+from rite.richtext.rope import Rope
+from common import _em, _st
+
+brave = _em(Join(['br', _st('a'), 've']))
+
+
+@pytest.mark.parametrize("old,new,edits", [
+    ('hello', 'hello', []),
+    (brave, _em(Join(['br', _st('a'), 've'])), []),
+    ('hello', 'world', [Replace((), 'world')]),
+    ('hello', brave, [Replace((), brave)]),
+    (_em('x'), _st('x'), [Restyle((), Semantic('x', Semantics.STRONG))]),
+    (FontWeight('x', 400), FontWeight('x', 700),
+     [Restyle((), FontWeight('x', 700))]),
+    (_em('x'), _st('y'), [Replace((), _st('y'))]),
+    (_em('x'), _em('y'), [Replace((0,), 'y')]),
+    (Join(['a', 'b', 'c']), Join(['a', 'c']), [Delete((1,))]),
+    (Join(['a', 'c']), Join(['a', 'b', 'c']), [Insert((1,), 'b')]),
+    (Join(['a', brave, 'c']), Join(['a', _em(Join(['br', _st('o')])), 'c']),
+     [Replace((1, 0, 1, 0), 'o'), Delete((1, 0, 2))]),
+    (Join(['a', 'b', 'c', 'd']), Join(['x', 'y', 'z']),
+     [Replace((0,), 'x'), Replace((1,), 'y'), Replace((2,), 'z'),
+      Delete((3,))]),
+    (Join(['a']), Join(['x', 'y', 'z']),
+     [Replace((0,), 'x'), Insert((1,), 'y'), Insert((2,), 'z')]),
+])
+def test_text_diff(old: Text, new: Text, edits: List[Edit]) -> None:
+    assert text_diff(old, new) == edits
+    assert text_patch(old, edits) == new
+
+
+@pytest.mark.parametrize("old,new", [
+    (Join(['x', brave, 'y', _em('z'), 'w']),
+     Join([_st('x'), 'y', brave, _em(Join(['z', 'z'])), 'w', 'v'])),
+    (Rope([str(i) for i in range(100)]),
+     Rope([str(i) for i in range(100) if i % 7] + ['end'])),
+    (Join([brave, Join([_em('a'), 'b', _st('c')])]),
+     Join([brave, Join([_st('a'), 'b', _st('d'), 'e'])])),
+])
+def test_text_patch(old: Text, new: Text) -> None:
+    assert text_patch(old, text_diff(old, new)) == new
+    assert text_patch(new, text_diff(new, old)) == old
+
+
+def test_text_diff_skip_equal() -> None:
+    entries = [_em(Join([str(i), _st('x')])) for i in range(1000)]
+    old = Join(entries)
+    new = Join(entries[:500] + [_em('new')] + entries[501:])
+    assert text_diff(old, new) == [Replace((500, 0), 'new')]
+
+
+def _entries() -> List[Text]:
+    return [_em(Join([str(i), _st('x')])) for i in range(1000)]
+
+
+def test_text_diff_skip_equal_distinct(monkeypatch) -> None:
+    old = Join(_entries())
+    entries = _entries()
+    new = Join(entries[:500] + [_em('new')] + entries[501:])
+    keys: List[BaseText] = []
+    key = Join._key
+
+    def counted_key(self: Join) -> Tuple[Any, ...]:
+        keys.append(self)
+        return key(self)
+    monkeypatch.setattr(Join, '_key', counted_key)
+    assert text_diff(old, new) == [Replace((500, 0), 'new')]
+    assert len(keys) < 10
+
+
+def _deep(depth: int, leaf: str) -> Text:
+    text: Text = leaf
+    for i in range(depth):
+        text = Join([str(i), _em(text)])
+    return text
+
+
+def test_text_diff_deep() -> None:
+    depth = 2000
+    old, new = _deep(depth, 'x'), _deep(depth, 'y')
+    edits = text_diff(old, new)
+    assert edits == [Replace((1, 0) * depth, 'y')]
+    assert text_patch(old, edits) == new
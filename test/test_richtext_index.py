@@ -0,0 +1,76 @@
+import pytest
+
+from rite.richtext import Text, Join
+from rite.richtext.index import TextIndex, text_slice
+from rite.richtext.rope import Rope
+from rite.richtext.tape import tape_encode
+from rite.richtext.utils import text_raw
+from common import _em, _st
+
+brave = _em(Join(['br', _st('a'), 've']))
+
+
+@pytest.mark.parametrize("text", [
+    '',
+    'hello',
+    Join([]),
+    Join(['hello ', brave, '', ' world', _em('')]),
+    Join([brave, ' ', brave]),
+    Rope(['hello ', brave, ' world']),
+    tape_encode(['hello ', brave, ' world']),
+])
+def test_text_index_slice(text: Text) -> None:
+    raw = text_raw(text)
+    index = TextIndex(text)
+    assert len(index) == len(raw)
+    for start in range(-1, len(raw) + 2):
+        for stop in range(-1, len(raw) + 2):
+            assert text_raw(index.slice(start, stop)) \
+                == raw[max(start, 0):max(stop, 0)]
+            assert text_raw(index[start:stop]) == raw[start:stop]
+    for i in range(-len(raw), len(raw)):
+        assert text_raw(index[i]) == raw[i]
+    with pytest.raises(IndexError):
+        index[len(raw)]
+    with pytest.raises(IndexError):
+        index[-len(raw) - 1]
+
+
+def test_text_index_structure() -> None:
+    text = Join(['hello ', brave, ' world'])
+    index = TextIndex(text)
+    assert index.slice(0, len(index)) is text
+    assert index.slice(3, 8) == Join(['lo ', _em(Join(['br']))])
+    assert index.slice(6, 11) == Join([brave])
+    assert index.slice(6, 11).children[0] is brave  # type: ignore
+    assert text_slice(text, 7, 9) == Join([_em(Join(['r', _st('a')]))])
+    assert text_slice('hello', 1, 3) == 'el'
+    assert index[8] == Join([_em(Join([_st('a')]))])
+    with pytest.raises(ValueError):
+        index[::2]
+    with pytest.raises(TypeError):
+        index['x']  # type: ignore
+
+
+def test_text_index_styles_at() -> None:
+    text = Join(['hello ', brave, ' world'])
+    index = TextIndex(text)
+    assert index.styles_at(0) == []
+    assert index.styles_at(6) == [brave]
+    assert index.styles_at(8) == [brave, _st('a')]
+    assert index.styles_at(16) == []
+    with pytest.raises(IndexError):
+        index.styles_at(17)
+    with pytest.raises(IndexError):
+        index.styles_at(-1)
+
+
+def test_text_index_deep() -> None:
+    depth = 10000
+    text: Text = 'x'
+    for _ in range(depth):
+        text = _em(Join(['a', text, 'b']))
+    index = TextIndex(text)
+    assert len(index) == 2 * depth + 1
+    assert len(index.styles_at(depth)) == depth
+    assert text_raw(index.slice(depth - 1, depth + 2)) == 'axb'
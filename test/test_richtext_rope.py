@@ -0,0 +1,70 @@
+import math
+import pickle
+
+import pytest
+
+from rite.render.html import RenderHtml
+from rite.richtext import Join
+from rite.richtext.rope import Rope, _height
+from rite.richtext.utils import text_raw, text_upper
+from common import _em
+
+
+def test_rope_empty() -> None:
+    rope = Rope()
+    assert list(rope) == []
+    assert len(rope) == 0
+    assert rope == Rope([])
+    assert rope + rope == rope
+    with pytest.raises(IndexError):
+        rope[0]
+
+
+def test_rope_sequence() -> None:
+    items = [str(i) for i in range(100)]
+    rope = Rope(items)
+    assert list(rope) == items
+    assert len(rope) == 100
+    assert [rope[i] for i in range(-100, 100)] == items + items
+    with pytest.raises(IndexError):
+        rope[100]
+    with pytest.raises(IndexError):
+        rope[-101]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 10, 33])
+def test_rope_split(size: int) -> None:
+    items = [str(i) for i in range(size)]
+    rope = Rope(items)
+    for index in range(-1, size + 2):
+        left, right = rope.split(index)
+        assert list(left) == items[:max(index, 0)]
+        assert list(right) == items[max(index, 0):]
+        assert left + right == rope
+
+
+def test_rope_append_balanced() -> None:
+    rope = Rope()
+    size = 5000
+    for i in range(size):
+        rope = rope.append(str(i))
+    assert list(rope) == [str(i) for i in range(size)]
+    assert rope._tree is not None
+    assert _height(rope._tree) <= 1.45 * math.log2(size + 2)
+    rope2 = Rope()
+    for i in reversed(range(size)):
+        rope2 = Rope([str(i)]) + rope2
+    assert rope == rope2
+    assert hash(rope) == hash(rope2)
+    assert rope2._tree is not None
+    assert _height(rope2._tree) <= 1.45 * math.log2(size + 2)
+
+
+def test_rope_text() -> None:
+    rope = Rope(['hello ', _em('brave')]).append(Rope([' world']))
+    join = Join(['hello ', _em('brave'), Join([' world'])])
+    assert text_raw(rope) == 'hello brave world'
+    assert text_raw(text_upper(rope)) == text_raw(text_upper(join))
+    assert ''.join(RenderHtml()(rope)) == ''.join(RenderHtml()(join))
+    assert pickle.loads(pickle.dumps(rope)) == rope
+    assert rope != join
@@ -0,0 +1,61 @@
+from typing import List, Iterable
+
+import pytest
+
+from rite.render import RenderProtocol
+from rite.render.html import RenderHtml
+from rite.render.latex import RenderLatex
+from rite.render.markdown import RenderMarkdown
+from rite.render.plaintext import RenderPlaintext
+from rite.render.rst import RenderRst
+from rite.render.xml import RenderXml
+from rite.richtext import (
+    Text, Join, FontSize, FontSizes, FontStyle, FontStyles, FontVariant,
+    FontVariants, FontWeight
+)
+from rite.richtext.tape import tape_encode, tape_decode
+from common import _em, _st, _tt, _b, _i
+
+texts_list: List[List[Text]] = [
+    [],
+    [''],
+    ['hello'],
+    ['hello ', _em('brave'), ' world!'],
+    ['hello ', _em('"<[*]>"'), ' world!'],
+    [_st(Join(['h', _em('e'), 'l', _tt('l'), 'o']))],
+    [Join([Join([]), Join(['a', Join(['b'])])]), 'c'],
+    [_b('hi'), _i('hi'), FontWeight('hi', 900)],
+    [FontWeight(FontVariant(FontStyle(FontSize(
+        'hi', FontSizes.XX_LARGE), FontStyles.OBLIQUE),
+        FontVariants.SMALL_CAPS), 300)],
+    [tape_encode(['x', _em('y')]), _em(tape_encode([_em('z')]))],
+]
+
+
+@pytest.mark.parametrize("texts", texts_list)
+def test_tape_roundtrip(texts: List[Text]) -> None:
+    tape = tape_encode(texts)
+    assert list(tape) == texts
+    assert tape_decode(tape_encode([Join(texts)])) == Join(texts)
+    assert tape.replace(texts) == tape
+
+
+@pytest.mark.parametrize("texts", texts_list)
+def test_tape_render(texts: List[Text]) -> None:
+    tape = tape_encode(texts)
+    renders: List[RenderProtocol[Iterable[str]]] = [
+        RenderHtml(), RenderLatex(), RenderMarkdown(),
+        RenderPlaintext(), RenderRst()]
+    for render in renders:
+        assert ''.join(render(tape)) == ''.join(render(Join(texts)))
+    head1, elements1 = RenderXml()(tape)
+    head2, elements2 = RenderXml()(Join(texts))
+    assert (head1 or '') == (head2 or '')
+    assert [e.tag for e in elements1] == [e.tag for e in elements2]
+
+
+def test_tape_intern() -> None:
+    tape = tape_encode([_em('a'), 'b', _em('a'), Join(['b']), Join(['b'])])
+    assert tape.strings == ('a', 'b')
+    assert tape.styles == (_em(''), Join([]))
+    assert len(tape.ops) == 13
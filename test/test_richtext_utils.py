@@ -1,14 +1,15 @@
-from typing import Callable, List, Dict
+from typing import Callable, Iterator, List, Dict, Tuple
 
 import pytest
 
-from rite.richtext import Join, Text
+from rite.richtext import Join, Text, FontWeight, FontStyle, FontStyles
 from rite.richtext.utils import (
     list_join, text_fmap, text_raw, text_is_empty,
     text_is_lower, text_is_upper, text_lower, text_upper,
-    text_capitalize, text_capfirst,
+    text_capitalize, text_capfirst, text_events, text_normalize,
+    texts_normalize, text_transform,
 )
-from common import _em
+from common import _em, _st
 
 
 @pytest.mark.parametrize(
@@ -144,3 +145,103 @@ def test_text_capfirst(text: Text, result: Text):
 def test_list_join(
         inputs: List[str], outputs: List[str], kwargs: Dict[str, str]):
     assert list_join(inputs, **kwargs) == outputs
+
+
+@pytest.mark.parametrize("size,taken,kwargs", [
+    (10, 10, dict(sep=", ")),
+    (10, 3, dict(sep=", ", other=" et al.")),
+    (2, 2, dict(sep=", ", other=" et al.")),
+    (10, 10, dict(other=" et al.")),
+])
+def test_list_join_lazy(size: int, taken: int, kwargs: Dict[str, str]):
+    taken_items: List[str] = []
+
+    def items() -> Iterator[str]:
+        for i in range(size):
+            taken_items.append(str(i))
+            yield str(i)
+    assert list_join(items(), **kwargs) == list_join(
+        [str(i) for i in range(size)], **kwargs)
+    assert len(taken_items) == taken
+
+
+def test_text_events() -> None:
+    text = Join(['a', _em(Join(['b', _em('c')])), Join([])])
+    assert list(text_events('a')) == ['a']
+    assert list(text_events(text)) == [
+        text, 'a', _em(Join(['b', _em('c')])), Join(['b', _em('c')]), 'b',
+        _em('c'), 'c', None, None, None, Join([]), None, None]
+
+
+def _deep_text(depth: int) -> Text:
+    text: Text = 'x'
+    for i in range(depth):
+        text = _em(Join([str(i % 10), text]))
+    return text
+
+
+def test_deep_text() -> None:
+    depth = 10000
+    text = _deep_text(depth)
+    raw = text_raw(text)
+    assert len(raw) == depth + 1
+    assert text_raw(text_upper(text)) == raw.upper()
+    assert sum(event is None for event in text_events(text)) == 2 * depth
+
+
+@pytest.mark.parametrize("text,result", [
+    ('', ''),
+    ('hello', 'hello'),
+    (Join([]), ''),
+    (Join(['', '']), ''),
+    (Join(['hello']), 'hello'),
+    (Join(['hel', '', 'lo']), 'hello'),
+    (Join([Join(['h', 'e']), Join([Join(['l']), 'lo'])]), 'hello'),
+    (Join(['a', _em(Join(['b', 'c'])), 'd', Join(['e', _em('')])]),
+     Join(['a', _em('bc'), 'de'])),
+    (_em(''), ''),
+    (_em(Join(['', _st('')])), ''),
+    (_em(_em('x')), _em(_em('x'))),
+    (FontWeight(FontWeight('x', 700), 700), FontWeight('x', 700)),
+    (FontWeight(FontWeight('x', 400), 700),
+     FontWeight(FontWeight('x', 400), 700)),
+    (FontStyle(Join([FontStyle('x', FontStyles.ITALIC)]), FontStyles.ITALIC),
+     FontStyle('x', FontStyles.ITALIC)),
+])
+def test_text_normalize(text: Text, result: Text):
+    assert text_normalize(text) == result
+    assert text_normalize(result) is result
+
+
+def test_texts_normalize() -> None:
+    assert texts_normalize([]) == []
+    assert texts_normalize(['', Join([])]) == []
+    assert texts_normalize(['a', Join(['b', _em('c')])]) == ['ab', _em('c')]
+
+
+def test_text_transform() -> None:
+    calls: List[Tuple[str, int, str]] = []
+
+    def capwords(value: str, offset: int, last: str) -> str:
+        calls.append((value, offset, last))
+        return ''.join(
+            char.upper() if (last if i == 0 else value[i - 1]) in ' ' else char
+            for i, char in enumerate(value))
+
+    text = Join(['', 'hello w', _em('orld and'), ' ', _em(' b'), 'ye'])
+    assert text_transform(capwords, text) == Join(
+        ['', 'Hello W', _em('orld And'), ' ', _em(' B'), 'ye'])
+    assert calls == [
+        ('', 0, ''), ('hello w', 0, ''), ('orld and', 7, 'w'), (' ', 15, 'd'),
+        (' b', 16, ' '), ('ye', 18, 'b')]
+
+
+def test_text_transform_reuse() -> None:
+    text = Join([_em('Hello'), _st(Join([' world', _em('!')]))])
+    assert text_capfirst(text) is text
+    assert text_lower(text) is not text
+    hello = _em('HELLO')
+    result = text_upper(Join([hello, _st(' world')]))
+    assert result == Join([hello, _st(' WORLD')])
+    assert isinstance(result, Join)
+    assert result.children[0] is hello
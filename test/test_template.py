@@ -1,6 +1,10 @@
 import dataclasses
 import datetime
+import pickle
 import sys
+from typing import Dict, List
+
+import pytest
 
 from common import _tt, _em, _st
 
@@ -15,7 +19,8 @@ from rite.richtext import (
 )
 from rite.style.template import (
     Node, str_, join, capfirst, capitalize, lower, upper, semantic, font_size,
-    font_style, font_variant, font_weight
+    font_style, font_variant, font_weight, memoize, template_build,
+    template_describe
 )
 
 
@@ -128,3 +133,97 @@ def test_style() -> None:
         ' ', FontVariant('is', FontVariants.SMALL_CAPS),
         ' ', FontWeight(_tt('merlin'), 900),
     ])
+
+
+def get_name(data: Dict[str, str]) -> Text:
+    return data['name']
+
+
+def test_pickle() -> None:
+    template: Node[Dict[str, str]] = capfirst(join([
+        semantic(get_name, Semantics.EMPHASIS),
+        font_weight(str_('bold'), 700),
+        upper(str_(' world'))], ', ', ' and ', other=_em(' et al.')))
+    data = dict(name='john')
+    template2 = pickle.loads(pickle.dumps(template))
+    assert template2 == template
+    assert template2(data) == template(data)
+    assert template_build(template_describe(template)) == template
+
+
+def test_describe() -> None:
+    template: Node[Dict[str, str]] = join(
+        [lower(get_name), str_('!')], sep=' ')
+    assert template_describe(template) == (
+        'join', [('lower', get_name), ('str_', '!')], ' ', None, None, None,
+        False)
+    assert template_describe(get_name) is get_name
+
+
+def test_memoize() -> None:
+    calls = []
+
+    def upper_name(data: Dict[str, str]) -> Text:
+        calls.append(data['name'])
+        return data['name'].upper()
+    template = memoize(upper_name, maxsize=2, key=get_name)
+    names = ['a', 'b', 'a', 'c', 'b', 'c']
+    assert [template(dict(name=n)) for n in names] == \
+        ['A', 'B', 'A', 'C', 'B', 'C']
+    assert calls == ['a', 'b', 'c', 'b']
+    assert template.cache_info() == (2, 4, 2, 2)
+    template2 = pickle.loads(pickle.dumps(memoize(get_name)))
+    assert template2.cache_info() == (0, 0, 128, 0)
+    template.cache_clear()
+    assert template.cache_info() == (0, 0, 2, 0)
+
+
+def test_memoize_unhashable() -> None:
+    person = Person(name='John', birthday=datetime.date(1998, 3, 7))
+    template_name: Node[Person] = memoize(name())
+    with pytest.raises(TypeError, match='pass a key function'):
+        template_name(person)
+    template_get = memoize(get_name)
+    with pytest.raises(TypeError, match='pass a key function'):
+        template_get(dict(name='John'))
+    template_key = memoize(name(), key=lambda data: data.name)
+    assert template_key(person) == template_key(person) == 'John'
+    assert template_key.cache_info() == (1, 1, 128, 1)
+
+
+def test_memoize_shared() -> None:
+    template: Node[str] = join(
+        [str_('<'), memoize(upper(str_data())), str_('>')])
+    assert template('x') == Join(['<', _tt('X'), '>'])
+    text1, text2 = template('x'), template('x')
+    assert isinstance(text1, Join) and isinstance(text2, Join)
+    assert text1.children[1] is text2.children[1]
+
+
+def counted(calls: List[str], value: str) -> Node[object]:
+    def fmt(data: object) -> Text:
+        calls.append(value)
+        return value
+    return fmt
+
+
+def test_join_lazy() -> None:
+    calls: List[str] = []
+    template = join([counted(calls, str(i)) for i in range(100)],
+                    ', ', other=' et al.')
+    assert template(None) == Join(['0', ' et al.'])
+    assert calls == ['0']
+
+
+def test_join_skip_empty() -> None:
+    calls: List[str] = []
+    template = join([counted(calls, value)
+                     for value in ['', 'a', '', 'b', 'c', 'd']],
+                    ', ', ' and ', other=' et al.', skip_empty=True)
+    assert template(None) == Join(['a', ' et al.'])
+    assert calls == ['', 'a', '', 'b', 'c']
+    template2: Node[object] = join(
+        [str_(''), str_('a'), font_weight(str_(''), 700), str_('b')],
+        ', ', ' and ', skip_empty=True)
+    assert template2(None) == Join(['a', ' and ', 'b'])
+    assert pickle.loads(pickle.dumps(template2)) == template2
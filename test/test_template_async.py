@@ -0,0 +1,59 @@
+import asyncio
+from typing import Dict, List
+
+from rite.richtext import Join, Semantics, Text
+from rite.style.shared import template_share
+from rite.style.template import (
+    Node, join, memoize, semantic, str_, template_acall, upper
+)
+from common import _em
+
+
+def field(name: str, running: List[int]) -> Node[Dict[str, str]]:
+    async def fmt(data: Dict[str, str]) -> Text:
+        running[0] += 1
+        running[1] = max(running[0], running[1])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return data[name]
+    return fmt  # type: ignore
+
+
+def sync_field(name: str) -> Node[Dict[str, str]]:
+    def fmt(data: Dict[str, str]) -> Text:
+        return data[name]
+    return fmt
+
+
+def test_template_acall() -> None:
+    running = [0, 0]  # number of running fetches, and its maximum
+    template: Node[Dict[str, str]] = join([
+        semantic(upper(field('a', running)), Semantics.EMPHASIS),
+        memoize(field('b', running), key=lambda data: data['b']),
+        join([field('c', running), str_(''), sync_field('c')],
+             ', ', skip_empty=True),
+    ], ' ')
+    data = dict(a='x', b='y', c='z')
+    result = asyncio.run(template_acall(template, data))
+    assert result == Join([
+        _em('X'), ' ', 'y', ' ', Join(['z', ', ', 'z'])])
+    assert running == [0, 3]
+    synchronous: Node[Dict[str, str]] = join([
+        semantic(upper(sync_field('a')), Semantics.EMPHASIS),
+        sync_field('b'),
+        join([sync_field('c'), str_(''), sync_field('c')], ', ',
+             skip_empty=True)], ' ')
+    assert synchronous(data) == result
+
+
+def test_template_acall_shared() -> None:
+    running = [0, 0]
+    a = upper(field('a', running))
+    shared = template_share(join([a, a, str_('!')], ', ', ' and '))
+    result = asyncio.run(template_acall(shared, dict(a='x')))
+    assert result == Join(['X', ', ', 'X', ', ', '!'])
+    assert (shared.evaluated, shared.saved) == (1, 1)
+
+
+def test_template_acall_opaque() -> None:
+    assert asyncio.run(template_acall(sync_field('a'), dict(a='x'))) == 'x'
@@ -0,0 +1,63 @@
+from operator import itemgetter
+from typing import Iterator, List, Optional
+
+import pytest
+
+from rite.render.html import RenderHtml
+from rite.richtext import Semantics
+from rite.style.batch import render_many
+from rite.style.template import Description, template_build
+
+template: Description = ('join', [
+    ('semantic', itemgetter('name'), Semantics.EMPHASIS),
+    ('str_', ' & '),
+    ('upper', itemgetter('title'))])
+
+records = [dict(name=f'name{i}', title=f'title{i}') for i in range(50)]
+results = [f'<em>name{i}</em> &amp; TITLE{i}' for i in range(50)]
+
+
+@pytest.mark.parametrize("workers", [0, 1, 2, None])
+def test_render_many(workers: Optional[int]) -> None:
+    assert list(render_many(template, records, 'html', workers=workers,
+                            chunksize=7)) == results
+
+
+def test_render_many_renderer() -> None:
+    assert list(render_many(template, iter(records), RenderHtml(),
+                            workers=2)) == results
+
+
+def test_render_many_node() -> None:
+    assert list(render_many(template_build(template), records, 'html',
+                            workers=2)) == results
+
+
+def test_render_many_early_exit() -> None:
+    rendered = render_many(template, records, 'html', workers=2, chunksize=1)
+    assert next(rendered) == results[0]
+    rendered.close()
+
+
+def test_render_many_consumes_lazily() -> None:
+    taken: List[int] = []
+
+    def many_records() -> Iterator[dict]:
+        for i in range(10000):
+            taken.append(i)
+            yield dict(name=f'name{i}', title=f'title{i}')
+    rendered = render_many(template, many_records(), 'html', workers=2,
+                           chunksize=5)
+    assert next(rendered) == results[0]
+    assert len(taken) <= 5 * 5
+    rendered.close()
+
+
+@pytest.mark.parametrize("bad_template,renderer,error", [
+    (('bogus',), 'html', KeyError),
+    (template, 'bogus', ImportError),
+])
+def test_render_many_error(bad_template: Description, renderer: str,
+                           error: type) -> None:
+    with pytest.raises(error):
+        list(render_many(bad_template, records, renderer, workers=2))
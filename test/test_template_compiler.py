@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from rite.richtext import (
+    Join, Semantics, FontSizes, FontStyles, FontVariants, Text
+)
+from rite.style.compiler import template_compile, template_source
+from rite.style.template import Description, template_build
+from test_template import str_data, name, birthday, Person
+from common import _tt, _em, _st
+
+
+@pytest.mark.parametrize("description,data,result", [
+    (('str_', 'hi'), None, 'hi'),
+    (('join', [str_data(), ('str_', ' world')]), 'hello',
+     Join([_tt('hello'), ' world'])),
+    (('join', [('semantic', name(), Semantics.EMPHASIS),
+               ('str_', ': '),
+               ('semantic', birthday("%b %d, %Y"), Semantics.STRONG)]),
+     Person(name='John', birthday=datetime.date(1998, 3, 7)),
+     Join([_em('John'), ': ', _st('Mar 07, 1998')])),
+    (('capfirst', ('join', [('str_', ''), str_data(), ('str_', ' world')])),
+     'hello', Join(['', _tt('Hello'), ' world'])),
+    (('capitalize', ('join', [('str_', ''), str_data()])), 'heLLo',
+     Join(['', _tt('Hello')])),
+    (('lower', str_data()), 'heLLo', _tt('hello')),
+    (('upper', str_data()), 'heLLo', _tt('HELLO')),
+    (('join', [
+        ('font_size', ('str_', 'my'), FontSizes.SMALL),
+        ('font_style', ('str_', 'name'), FontStyles.ITALIC),
+        ('font_variant', ('str_', 'is'), FontVariants.SMALL_CAPS),
+        ('font_weight', str_data(), 900)], ' '), 'merlin', None),
+    (('join', [str_data(), str_data()], ', ', ' and '), 'x', None),
+    (('join', [str_data(), str_data(), str_data()], ', ', None, _em(' & ')),
+     'x', Join([_tt('x'), ', ', _tt('x'), _em(' & '), _tt('x')])),
+    (('join', [str_data(), ('str_', 'b'), ('str_', 'c')], ', ', ' and ',
+      ', and ', ' et al.'), 'x', Join([_tt('x'), ' et al.'])),
+    (('join', []), 'x', Join([])),
+    (('join', [('str_', ''), str_data(), ('lower', ('str_', '')),
+               str_data()], ', ', ' and ', None, None, True), 'x',
+     Join([_tt('x'), ' and ', _tt('x')])),
+    (('join', [('memoize', ('upper', str_data())), ('str_', '!')]), 'x',
+     Join([_tt('X'), '!'])),
+])
+def test_template_compile(
+        description: Description, data: object, result: Text) -> None:
+    expected = template_build(description)(data)
+    if result is not None:
+        assert expected == result
+    assert template_compile(description)(data) == expected
+
+
+def test_template_source() -> None:
+    source = template_source(('join', [
+        ('semantic', str_data(), Semantics.CODE), ('str_', 'x')], ', '))
+    assert source == '\n'.join([
+        "def template(data):",
+        "    _v0 = _c0(data)",
+        "    _v1 = _c1(_v0, _c2)",
+        "    _v2 = _c3([_v1, ', ', 'x'])",
+        "    return _v2",
+    ])
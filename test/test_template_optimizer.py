@@ -0,0 +1,64 @@
+import datetime
+
+import pytest
+
+from rite.richtext import Join, Semantics, FontStyles, Text
+from rite.style.compiler import template_compile
+from rite.style.optimizer import template_optimize
+from rite.style.template import (
+    ConstNode, Description, JoinNode, template_build, join, str_, upper
+)
+from test_template import str_data, name, birthday, Person
+from common import _tt, _em
+
+
+@pytest.mark.parametrize("description,data", [
+    (('str_', 'hi'), None),
+    (('join', [str_data(), ('str_', ' world')]), 'hello'),
+    (('join', [('semantic', name(), Semantics.EMPHASIS),
+               ('str_', ': '),
+               ('semantic', birthday("%b %d, %Y"), Semantics.STRONG)], ', '),
+     Person(name='John', birthday=datetime.date(1998, 3, 7))),
+    (('capfirst', ('join', [('str_', ''), str_data(), ('str_', ' world')])),
+     'hello'),
+    (('join', [('upper', ('str_', 'a')), str_data(), str_data()],
+      ', ', ' and ', _em(', and ')), 'x'),
+    (('join', [str_data(), ('str_', 'b'), ('str_', 'c')], ', ', ' and ',
+      ', and ', ' et al.'), 'x'),
+    (('font_style', ('join', [('str_', 'a'), ('lower', ('str_', 'B'))], '-'),
+      FontStyles.ITALIC), None),
+    (('join', [('memoize', ('upper', ('str_', 'a'))), str_data()]), 'x'),
+    (('join', []), 'x'),
+    (('join', [('str_', ''), str_data(), ('str_', 'a')], ', ', None, None,
+      None, True), 'x'),
+    (('join', [('str_', ''), ('str_', 'a'), ('str_', 'b')], ', ', ' & ', None,
+      None, True), 'x'),
+    (('join', [('str_', ''), ('str_', 'a'), str_data()], ', ', ' & ', None,
+      None, True), ''),
+])
+def test_template_optimize(description: Description, data: object) -> None:
+    expected = template_build(description)(data)
+    assert template_optimize(description)(data) == expected
+    assert template_compile(template_optimize(description))(data) == expected
+
+
+def test_template_optimize_const() -> None:
+    template = template_optimize(
+        join([upper(str_('a')), str_('b')], ', '))
+    assert template == ConstNode(Join(['A', ', ', 'b']))
+    assert template(None) is template('x')
+
+
+def test_template_optimize_layout() -> None:
+    template = template_optimize(join(
+        [str_data(), upper(str_data()), str_data()], ', ', other=' et al.'))
+    assert isinstance(template, JoinNode)
+    assert len(template.children) == 2
+    assert template('x') == Join([_tt('x'), ' et al.'])
+    assert template.sep is None and template.other is None
+
+
+def test_template_optimize_opaque() -> None:
+    def text(data: object) -> Text:
+        return 'x'
+    assert template_optimize(text) is text
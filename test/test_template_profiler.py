@@ -0,0 +1,45 @@
+from rite.richtext import Join, Text
+from rite.style.profiler import template_profile
+from rite.style.template import Node, join, lower, str_, upper
+
+
+def name(data: str) -> Text:
+    return data
+
+
+def test_template_profile() -> None:
+    upper_name = upper(name)
+    template: Node[str] = join(
+        [upper_name, str_(': '), upper_name, lower(name), str_('x')],
+        ', ', other=' et al.')
+    profiled = template_profile(template)
+    for data in ['ab', 'cde']:
+        assert profiled(data) == template(data) == Join(
+            [data.upper(), ' et al.'])
+    assert [(stats.name, stats.depth, stats.calls, stats.size)
+            for stats in profiled.stats] == [
+        ('join', 0, 2, 19),
+        ('upper', 1, 2, 5),
+        ('name', 2, 2, 5),
+        ('str_', 1, 0, 0),
+        ('lower', 1, 0, 0),
+        ('str_', 1, 0, 0),
+    ]
+    for stats in profiled.stats:
+        assert 0 <= stats.own_time <= stats.total_time
+    root, upper_stats, name_stats = profiled.stats[:3]
+    assert root.total_time >= upper_stats.total_time
+    assert upper_stats.total_time >= name_stats.total_time
+    lines = profiled.report().splitlines()
+    assert len(lines) == 7
+    assert lines[0].split() == ['calls', 'total', 'own', 'size', 'node']
+    assert lines[3].split()[0] == '2' and lines[3].endswith('    name')
+    profiled.reset()
+    assert all(stats.calls == stats.size == 0 for stats in profiled.stats)
+
+
+def test_template_profile_untouched() -> None:
+    template: Node[str] = join([name, str_('!')])
+    profiled = template_profile(template)
+    assert profiled.root is not template
+    assert template('x') == profiled('x') == Join(['x', '!'])
@@ -0,0 +1,52 @@
+import pickle
+from typing import Dict, List
+
+from rite.richtext import Join, Semantics, Text
+from rite.style.shared import template_share
+from rite.style.template import (
+    Node, join, lower, memoize, semantic, str_, upper
+)
+from common import _em
+
+
+def get_name(data: Dict[str, str]) -> Text:
+    return data['name']
+
+
+def test_template_share() -> None:
+    calls: List[str] = []
+
+    def name(data: str) -> Text:
+        calls.append(data)
+        return data
+    emphasized = semantic(upper(name), Semantics.EMPHASIS)
+    template: Node[str] = join([
+        emphasized, str_(': '), join([emphasized, lower(name)], ', ')])
+    shared = template_share(template)
+    for data in ['ab', 'cd']:
+        expected = template(data)
+        calls.clear()
+        assert shared(data) == expected
+        assert calls == [data]
+    assert shared('ab') == Join(
+        [_em('AB'), ': ', Join([_em('AB'), ', ', 'ab'])])
+    assert (shared.evaluated, shared.saved) == (6, 6)
+
+
+def test_template_share_unshared() -> None:
+    template: Node[object] = join(
+        [str_('a'), str_('a'), upper(str_('b'))])
+    shared = template_share(template)
+    assert shared.root is template
+    assert shared(None) == template(None)
+    assert (shared.evaluated, shared.saved) == (0, 0)
+
+
+def test_template_share_memoize_pickle() -> None:
+    name = memoize(get_name, key=get_name)
+    shared = template_share(join([name, name], ' & '))
+    assert shared(dict(name='x')) == Join(['x', ' & ', 'x'])
+    assert (shared.evaluated, shared.saved) == (1, 1)
+    shared2 = pickle.loads(pickle.dumps(shared))
+    assert shared2(dict(name='y')) == Join(['y', ' & ', 'y'])
+    assert (shared2.evaluated, shared2.saved) == (1, 1)
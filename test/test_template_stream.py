@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, List
+from xml.etree.ElementTree import tostring
+
+import pytest
+
+from rite.render import RenderProtocol
+from rite.render.html import RenderHtml
+from rite.render.latex import RenderLatex
+from rite.render.markdown import RenderMarkdown
+from rite.render.plaintext import RenderPlaintext
+from rite.render.rst import RenderRst
+from rite.render.xml import RenderXml
+from rite.richtext import (
+    BaseText, Event, Semantics, FontSizes, FontStyles, FontVariants, Join, Text
+)
+from rite.richtext.utils import text_events, text_style
+from rite.style.template import (
+    Node, capfirst, const, font_size, font_style, font_variant, font_weight,
+    join, memoize, semantic, str_, template_events, template_render, upper
+)
+from common import _em
+
+
+def field(name: str) -> Node[Dict[str, str]]:
+    def fmt(data: Dict[str, str]) -> Text:
+        return data[name]
+    return fmt
+
+
+def title(data: Dict[str, str]) -> Text:
+    return Join([_em(data['title']), ' <&>'])
+
+
+templates: List[Node[Dict[str, str]]] = [
+    str_('plain'),
+    field('name'),
+    join([]),
+    join([field('name'), str_(''), const(_em('x'))], ', ', ' and '),
+    semantic(join([field('name'), title]), Semantics.STRONG),
+    capfirst(join([str_(''), font_style(field('name'), FontStyles.ITALIC)])),
+    join([
+        font_size(upper(field('name')), FontSizes.SMALL),
+        font_variant(title, FontVariants.SMALL_CAPS),
+        font_weight(semantic(field('name'), Semantics.CODE), 700),
+        memoize(title, key=lambda data: data['title']),
+        join([str_(''), field('name'), str_('')], '; ', skip_empty=True),
+    ], ' ', other=' et al.'),
+    join([
+        font_weight(str_('bold'), 700),
+        semantic(font_style(field('name'), FontStyles.ITALIC),
+                 Semantics.EMPHASIS),
+        join([title, title], ', ', ' & ')], ' | ', ' ~ ', ' ; '),
+]
+
+renderers: List[RenderProtocol[Any]] = [
+    RenderHtml(), RenderLatex(), RenderMarkdown(), RenderPlaintext(),
+    RenderRst(),
+]
+
+
+def _style_events(events: Iterable[Event]) -> List[Event]:
+    # opening events only carry their style, their children are ignored
+    return [text_style(event) if isinstance(event, BaseText) else event
+            for event in events]
+
+
+@pytest.mark.parametrize("template", templates)
+def test_template_events(template: Node[Dict[str, str]]) -> None:
+    data = dict(name='john', title='a *title*')
+    assert _style_events(template_events(template, data)) \
+        == _style_events(text_events(template(data)))
+
+
+@pytest.mark.parametrize("template", templates)
+@pytest.mark.parametrize("renderer", renderers)
+def test_template_render(template: Node[Dict[str, str]],
+                         renderer: RenderProtocol[Any]) -> None:
+    data = dict(name='john', title='a *title*')
+    assert ''.join(template_render(template, data, renderer)) \
+        == ''.join(renderer(template(data)))
+
+
+@pytest.mark.parametrize("template", templates)
+def test_template_render_xml(template: Node[Dict[str, str]]) -> None:
+    data = dict(name='john', title='a *title*')
+    text1, elements1 = template_render(template, data, RenderXml())
+    text2, elements2 = RenderXml()(template(data))
+    assert text1 == text2
+    assert list(map(tostring, elements1)) == list(map(tostring, elements2))
+
+
+def test_template_render_fallback() -> None:
+    def render(text: Text) -> str:
+        return repr(text)
+    template: Node[object] = join([str_('a'), str_('b')])
+    assert template_render(template, None, render) == repr(template(None))